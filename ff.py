@@ -8,28 +8,51 @@ Enhanced Presales Assistant API with:
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import pandas as pd
 import numpy as np
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import os
 import math
+import asyncio
+import threading
 import json
+import sqlite3
+import logging
+import hashlib
+import re
 from pathlib import Path
+from urllib.parse import urlparse, quote
+from xml.sax.saxutils import escape as xml_escape
 import serpapi
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import requests
+from urllib3.util.retry import Retry
 import time
 import io
 import base64
 from datetime import datetime
+from collections import defaultdict
+from contextlib import closing
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Search/embedding diagnostics go through logging so they are filtered (and never
+# formatted) below LOG_LEVEL; defaults to WARNING for production
+log = logging.getLogger("presales")
+if not log.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_log_handler)
+    log.propagate = False
+log.setLevel(os.getenv("LOG_LEVEL", "WARNING").upper())
+
 # Free search alternatives
 try:
     from ddgs import DDGS
@@ -47,6 +70,38 @@ try:
 except ImportError:
     GOOGLE_SEARCH_AVAILABLE = False
 
+# Faster HTML parsing for scraped pages
+try:
+    import lxml.html
+    HTML_PARSER = "lxml"
+    LXML_AVAILABLE = True
+except ImportError:
+    HTML_PARSER = "html.parser"
+    LXML_AVAILABLE = False
+
+# Faster JSON for the on-disk caches
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# PDF export for /download_pitch (falls back to a plain-text download)
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, ListFlowable, ListItem
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+# Sparse keyword-overlap scoring (falls back to Python token sets)
+try:
+    from sklearn.feature_extraction.text import HashingVectorizer
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
 # ===================== CONFIG =====================
 PORTFOLIO_XLSX = Path(r"C:\Users\smuthiki\Downloads\presales_assistant\Project_Portfolio_Data.xlsx")
 
@@ -59,6 +114,20 @@ SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY", "")
 # Options: "serpapi", "duckduckgo", "google", "intelligent_mixed"
 SEARCH_ENGINE_PREFERENCE = "intelligent_mixed"  # Auto-cascade through engines for best results
 
+# Web search: queries searched concurrently per request
+SEARCH_QUERY_CONCURRENCY = 10
+
+# Minimum seconds between calls to each engine, shared by all concurrent queries
+SEARCH_ENGINE_MIN_INTERVAL = {"duckduckgo": 0.5, "google": 1.0, "serpapi": 0.1}
+
+# Portfolio/embeddings are rebuilt in the background; seconds between xlsx mtime checks
+PORTFOLIO_REFRESH_INTERVAL = 30
+
+# Embedding generation: texts per request / concurrent requests in flight.
+# The endpoint takes up to 2048 inputs (300k tokens) per call; rows are a few hundred tokens each.
+EMBEDDING_BATCH_SIZE = 256
+EMBEDDING_CONCURRENCY = 8
+
 app = FastAPI()
 
 # CORS configuration
@@ -108,11 +177,115 @@ class PortfolioSummaryResponse(BaseModel):
     industry_confidence: Optional[float] = None
 
 # ===================== CACHE =====================
-_portfolio_cache: Dict[str, Any] = {"df": None, "mtime": None}
-_embeddings_cache: Dict[str, Any] = {"embeddings": None, "mtime": None, "rows": None}
-EMBEDDINGS_CACHE_FILE = Path("portfolio_embeddings_cache.json")
+_portfolio_cache: Dict[str, Any] = {"snapshot": None}  # (df, mtime, features), published together
+_embeddings_cache: Dict[str, Any] = {"embeddings": None, "mtime": None, "rows": None, "snapshot": None}
+EMBEDDINGS_CACHE_FILE = Path("portfolio_embeddings_cache.npy")
+EMBEDDINGS_META_FILE = Path("portfolio_embeddings_cache.meta.json")
+EMBEDDINGS_STORAGE_DTYPE = np.float16  # on-disk precision; similarity math always runs in float32
+_embeddings_build_lock = threading.Lock()  # one rebuild at a time; waiters reuse its result
+
+# AI-generated search queries, keyed by (client, industry, focus); persisted across restarts
+SEARCH_QUERY_CACHE_FILE = Path("search_queries_cache.json")
+SEARCH_QUERY_CACHE_TTL = 3600  # seconds
+SEARCH_QUERY_CACHE_MAX = 256
+_search_query_cache: Dict[str, Any] = {"entries": None}  # lazily loaded from SEARCH_QUERY_CACHE_FILE
+_search_query_cache_lock = threading.Lock()
+
+# Query embeddings for select_rows_for_summary, keyed by a hash of the query text.
+# Held in memory (LRU) and persisted to SQLite so restarts keep their hits.
+QUERY_EMBEDDINGS_CACHE_FILE = Path("query_embeddings_cache.sqlite")
+QUERY_EMBEDDINGS_CACHE_MAX = 4096  # in-memory entries
+_query_embedding_cache: Dict[str, Any] = {"vectors": {}, "hits": 0, "misses": 0}
+_query_embedding_cache_lock = threading.Lock()
+
+# Chat completions keyed by the exact request (model, messages, sampling params); in-process only
+LLM_RESPONSE_CACHE_TTL = 86400  # seconds
+LLM_RESPONSE_CACHE_MAX = 512
+_llm_response_cache: Dict[str, tuple] = {}  # request hash -> (timestamp, message content)
+_llm_response_cache_lock = threading.Lock()
+
+# AI ticker lookups per client (in-process only; tickers rarely change)
+TICKER_CACHE_TTL = 86400  # seconds
+TICKER_CACHE_MAX = 4096
+_ticker_cache: Dict[str, tuple] = {}  # client (lowercased) -> (timestamp, ticker)
+_ticker_cache_lock = threading.Lock()
+
+# Shared pool for blocking search-engine calls (leaf calls only: nothing running here may
+# block on more work for this pool). Kept outside asyncio.run's default executor so a
+# cascade can return without waiting on engines it has cancelled.
+_search_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="search")
+
+# Keep-alive connection pool for SerpAPI so concurrent queries reuse TCP/TLS connections
+_serp_session = requests.Session()
+_serp_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=SEARCH_QUERY_CONCURRENCY))
+
+# Shared keep-alive pool for page scraping (Yahoo Finance, company sites): repeat hits on the
+# same host skip the TCP/TLS handshake; transient 429/5xx responses are retried with backoff
+SCRAPER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+_http_session = requests.Session()
+_http_session.headers.update({"User-Agent": SCRAPER_USER_AGENT})
+_http_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=32, pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=["GET"], raise_on_status=False)
+)
+_http_session.mount("https://", _http_adapter)
+_http_session.mount("http://", _http_adapter)
+MAX_PAGE_BYTES = 1024 * 1024  # scraped pages are truncated here; the text we use sits well inside it
+
+# OpenAI clients are built once and shared, so every request reuses one warm connection pool
+_openai_clients: Dict[str, Any] = {"sync": None, "async": None}
+_openai_clients_lock = threading.Lock()
+if not OPENAI_API_KEY:
+    log.warning("[OpenAI] OPENAI_API_KEY is not set; AI features will be unavailable")
+
+def _openai_client() -> OpenAI:
+    """Shared OpenAI client (thread-safe), created on first use."""
+    with _openai_clients_lock:
+        if _openai_clients["sync"] is None:
+            _openai_clients["sync"] = OpenAI(api_key=OPENAI_API_KEY)
+        return _openai_clients["sync"]
+
+def _async_openai_client() -> AsyncOpenAI:
+    """Shared AsyncOpenAI client for handlers on the server's event loop.
+
+    Its pooled connections belong to that loop, so code that spins up its own loop
+    with asyncio.run (e.g. _embed_all) must keep creating a private client.
+    """
+    with _openai_clients_lock:
+        if _openai_clients["async"] is None:
+            _openai_clients["async"] = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        return _openai_clients["async"]
 
 # ===================== HELPERS =====================
+def _read_json_file(path: Path) -> Any:
+    """Parse a JSON cache file (orjson when installed, stdlib json otherwise)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _loads_json(text: str) -> Any:
+    """Parse a JSON string (orjson when installed); failures raise json.JSONDecodeError either way."""
+    return orjson.loads(text) if ORJSON_AVAILABLE else json.loads(text)
+
+def _replace_file(path: Path, write) -> None:
+    """Write a file via `write(fileobj)` into a private temp file, then atomically swap it into place."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+def _write_json_file(path: Path, data: Any) -> None:
+    """Serialize `data` to a JSON cache file (orjson when installed, stdlib json otherwise)."""
+    if ORJSON_AVAILABLE:
+        _replace_file(path, lambda f: f.write(orjson.dumps(data)))
+    else:
+        _replace_file(path, lambda f: f.write(json.dumps(data).encode('utf-8')))
+
 def _safe_str(x: object) -> str:
     """Convert any value to safe string."""
     if x is None:
@@ -128,228 +301,517 @@ def load_portfolio_df() -> pd.DataFrame:
         return pd.DataFrame()
 
     mtime = p.stat().st_mtime
-    if _portfolio_cache["df"] is not None and _portfolio_cache["mtime"] == mtime:
-        return _portfolio_cache["df"]
+    snapshot = _portfolio_cache["snapshot"]
+    if snapshot is not None and snapshot[1] == mtime:
+        return snapshot[0]
 
+    # Open the workbook once for both sheets; dtype=str skips per-cell type inference
+    # (every column is treated as text downstream anyway)
     try:
-        df_active = pd.read_excel(p, sheet_name=0, engine="openpyxl")
-        df_active["status"] = "active"
+        workbook = pd.ExcelFile(p, engine="openpyxl")
     except Exception:
-        df_active = pd.DataFrame()
+        return pd.DataFrame()
 
-    try:
-        df_closed = pd.read_excel(p, sheet_name=1, engine="openpyxl")
-        df_closed["status"] = "closed"
-    except Exception:
-        df_closed = pd.DataFrame()
+    with workbook:
+        try:
+            df_active = workbook.parse(sheet_name=0, dtype=str)
+            df_active["status"] = "active"
+        except Exception:
+            df_active = pd.DataFrame()
+
+        try:
+            df_closed = workbook.parse(sheet_name=1, dtype=str)
+            df_closed["status"] = "closed"
+        except Exception:
+            df_closed = pd.DataFrame()
 
     df = pd.concat([df_active, df_closed], ignore_index=True)
 
     # Normalize column names to lowercase with underscores
-    df.columns = [col.lower().replace(' ', '_').replace('/', '_') for col in df.columns]
+    df.columns = [str(col).lower().replace(' ', '_').replace('/', '_') for col in df.columns]
 
-    # Normalize all string columns
-    for c in df.columns:
-        if df[c].dtype == 'object':
-            df[c] = df[c].apply(_safe_str)
+    # Normalize all columns (column-wise equivalent of _safe_str)
+    df = df.fillna('').astype(str).apply(lambda col: col.str.strip())
 
-    # Remove completely empty rows
-    df = df[df.apply(lambda row: any(row.astype(str).str.strip() != ''), axis=1)]
+    # Remove completely empty rows (ignoring the 'status' column we added above)
+    data_cols = df.columns.drop('status', errors='ignore')
+    df = df[df[data_cols].ne('').any(axis=1)]
     df.reset_index(drop=True, inplace=True)
 
-    _portfolio_cache["df"] = df
-    _portfolio_cache["mtime"] = mtime
+    # Build the features first and publish all three in one assignment, so a concurrent
+    # reader never sees the new frame paired with missing or stale features
+    features = build_scoring_features(df)
+    _portfolio_cache["snapshot"] = (df, mtime, features)
     return df
 
+def _normalize_rows(vecs: np.ndarray) -> np.ndarray:
+    """Scale each row to unit L2 norm (zero rows are left as zeros)."""
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vecs / norms
+
+async def _embed_all(texts: List[str]) -> List[List[float]]:
+    """Embed texts in batches of EMBEDDING_BATCH_SIZE with up to EMBEDDING_CONCURRENCY requests in flight."""
+    client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    sem = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+    batches = [texts[i:i+EMBEDDING_BATCH_SIZE] for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)]
+
+    async def embed_batch(batch: List[str]):
+        async with sem:
+            return await client.embeddings.create(
+                model="text-embedding-3-small",
+                input=batch,
+                dimensions=1536
+            )
+
+    responses = await asyncio.gather(*(embed_batch(b) for b in batches), return_exceptions=True)
+
+    # gather preserves batch order, so results line up with df rows
+    all_embeddings = []
+    for i, (batch, response) in enumerate(zip(batches, responses)):
+        if isinstance(response, Exception):
+            log.warning("[Embeddings] Error in batch %d: %s", i * EMBEDDING_BATCH_SIZE, response)
+            # Fallback: zero embeddings for failed batch
+            all_embeddings.extend([[0.0]*1536 for _ in range(len(batch))])
+        else:
+            all_embeddings.extend(item.embedding for item in response.data)
+    log.info("[Embeddings] Generated %d/%d", len(all_embeddings), len(texts))
+    return all_embeddings
+
+# Normalized header of the "Evoke Solution / Value Add to the Customer (What / How)" column
+VALUE_ADD_COLUMN = "evoke_solution_/_value_add_to_the_customer_(what_/_how)"
+
+# (label, column) pairs that make up each row's embedding input text
+EMBEDDING_TEXT_FIELDS = [
+    ("Client", "client_name"),
+    ("Industry", "industry"),
+    ("Technology", "technologies"),
+    ("Business Case", "business_case"),
+    ("Solution", VALUE_ADD_COLUMN),
+    ("Deliverables", "key_deliverables"),
+]
+
+def build_embedding_texts(df: pd.DataFrame) -> List[str]:
+    """Build one 'Label: value ...' text per row with column-wise string concatenation."""
+    texts = None
+    for label, column in EMBEDDING_TEXT_FIELDS:
+        part = f"{label}: " + _text_column(df, column)
+        texts = part if texts is None else texts + " " + part
+    return texts.tolist()
+
+def _embedding_text_hash(text: str) -> str:
+    """Stable short hash of a row's embedding input text."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+def _load_reusable_embeddings() -> Dict[str, np.ndarray]:
+    """Map text hash -> unit vector from the on-disk cache, regardless of its xlsx mtime.
+
+    Zero vectors (batches that failed to embed) are skipped so they get retried.
+    """
+    if not (EMBEDDINGS_META_FILE.exists() and EMBEDDINGS_CACHE_FILE.exists()):
+        return {}
+    try:
+        cache_meta = _read_json_file(EMBEDDINGS_META_FILE)
+        hashes = cache_meta.get("hashes") or []
+        stale = np.array(np.load(EMBEDDINGS_CACHE_FILE, mmap_mode='r'), dtype=np.float32)
+        if len(hashes) != len(stale):
+            return {}
+        if not cache_meta.get("normalized"):
+            stale = _normalize_rows(stale)
+        return {h: vec for h, vec in zip(hashes, stale) if np.any(vec)}
+    except Exception as e:
+        log.warning("[Embeddings] Stale cache read error: %s", e)
+        return {}
+
 def load_or_create_embeddings() -> tuple[np.ndarray, pd.DataFrame]:
-    """Load or generate embeddings for all portfolio rows with batch optimization."""
+    """Load or generate L2-normalized embeddings for all portfolio rows with batch optimization."""
     df = load_portfolio_df()
     if df.empty:
         return np.array([]), df
 
     xlsx_mtime = PORTFOLIO_XLSX.stat().st_mtime
 
-    # Check cache
-    if EMBEDDINGS_CACHE_FILE.exists():
+    # In-process cache: the float32 working copy built on first load
+    if _embeddings_cache_matches(xlsx_mtime, df):
+        return _embeddings_cache["embeddings"], df
+
+    # Serialize rebuilds: a caller that waited on the lock re-checks and reuses what the holder built
+    with _embeddings_build_lock:
+        if _embeddings_cache_matches(xlsx_mtime, df):
+            return _embeddings_cache["embeddings"], df
+        return _load_or_build_embeddings(df, xlsx_mtime)
+
+def _embeddings_cache_matches(xlsx_mtime: float, df: pd.DataFrame) -> bool:
+    """True when the in-memory embeddings were built from this Excel version and row count."""
+    return (_embeddings_cache["embeddings"] is not None and _embeddings_cache["mtime"] == xlsx_mtime
+            and _embeddings_cache["rows"] == len(df))
+
+def _load_or_build_embeddings(df: pd.DataFrame, xlsx_mtime: float) -> tuple[np.ndarray, pd.DataFrame]:
+    """Disk cache or (partial) rebuild for load_or_create_embeddings; caller holds _embeddings_build_lock."""
+    # Check disk cache (metadata side file + memory-mapped binary matrix)
+    if EMBEDDINGS_META_FILE.exists() and EMBEDDINGS_CACHE_FILE.exists():
         try:
-            with open(EMBEDDINGS_CACHE_FILE, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            cache_meta = _read_json_file(EMBEDDINGS_META_FILE)
             
-            if cache_data.get("xlsx_mtime") == xlsx_mtime and cache_data.get("row_count") == len(df):
-                print(f"[Embeddings] Loaded {len(cache_data['embeddings'])} cached embeddings")
-                embeddings = np.array(cache_data["embeddings"], dtype=np.float32)
+            if cache_meta.get("xlsx_mtime") == xlsx_mtime and cache_meta.get("row_count") == len(df):
+                # mmap pages the float16 file in once; the matmul itself runs in float32
+                # because NumPy has no BLAS kernel for half precision
+                embeddings = np.array(np.load(EMBEDDINGS_CACHE_FILE, mmap_mode='r'), dtype=np.float32)
+                log.info("[Embeddings] Loaded %d cached embeddings", len(embeddings))
+                if not cache_meta.get("normalized"):
+                    embeddings = _normalize_rows(embeddings)
+                _remember_embeddings(embeddings, xlsx_mtime, df)
                 return embeddings, df
         except Exception as e:
-            print(f"[Embeddings] Cache read error: {e}")
+            log.warning("[Embeddings] Cache read error: %s", e)
 
-    # Generate embeddings
-    print(f"[Embeddings] Generating embeddings for {len(df)} rows...")
-    client = OpenAI(api_key=OPENAI_API_KEY)
-    
     # Create text representations
-    texts = []
-    for idx, row in df.iterrows():
-        parts = [
-            f"Client: {row.get('client_name', '')}",
-            f"Industry: {row.get('industry', '')}",
-            f"Technology: {row.get('technologies', '')}",
-            f"Business Case: {row.get('business_case', '')}",
-            f"Solution: {row.get('evoke_solution_/_value_add_to_the_customer_(what_/_how)', '')}",
-            f"Deliverables: {row.get('key_deliverables', '')}"
-        ]
-        texts.append(" ".join(parts))
-
-    # Batch embedding generation (20 at a time for optimal speed)
-    BATCH_SIZE = 20
-    all_embeddings = []
-    
-    for i in range(0, len(texts), BATCH_SIZE):
-        batch = texts[i:i+BATCH_SIZE]
-        try:
-            response = client.embeddings.create(
-                model="text-embedding-3-small",
-                input=batch,
-                dimensions=1536
-            )
-            batch_embeddings = [item.embedding for item in response.data]
-            all_embeddings.extend(batch_embeddings)
-            print(f"[Embeddings] Generated {len(all_embeddings)}/{len(texts)}")
-        except Exception as e:
-            print(f"[Embeddings] Error in batch {i}: {e}")
-            # Fallback: zero embeddings for failed batch
-            all_embeddings.extend([[0.0]*1536 for _ in range(len(batch))])
-
-    embeddings = np.array(all_embeddings, dtype=np.float32)
+    texts = build_embedding_texts(df)
+    hashes = [_embedding_text_hash(text) for text in texts]
+
+    # Reuse vectors for rows whose text is unchanged since the stale cache was written
+    reusable = _load_reusable_embeddings()
+    embeddings = np.zeros((len(texts), 1536), dtype=np.float32)
+    missing = []
+    for i, text_hash in enumerate(hashes):
+        if text_hash in reusable:
+            embeddings[i] = reusable[text_hash]
+        else:
+            missing.append(i)
 
-    # Save cache
-    cache_data = {
+    # Generate embeddings
+    log.info("[Embeddings] Reusing %d cached embeddings, generating %d of %d rows...", len(texts) - len(missing), len(missing), len(df))
+    if missing:
+        # Batch embedding generation (EMBEDDING_BATCH_SIZE texts per request, batches sent concurrently)
+        new_embeddings = asyncio.run(_embed_all([texts[i] for i in missing]))
+        embeddings[missing] = _normalize_rows(np.array(new_embeddings, dtype=np.float32))
+
+    # Save cache - matrix first so the metadata never points at a missing/partial file; both are
+    # written to temp files and swapped in with os.replace, so concurrent workers never see a torn file.
+    # Unit vectors lose nothing meaningful for ranking in float16 and the file is half the size.
+    matrix = np.ascontiguousarray(embeddings, dtype=EMBEDDINGS_STORAGE_DTYPE)
+    _replace_file(EMBEDDINGS_CACHE_FILE, lambda f: np.save(f, matrix))
+    cache_meta = {
         "xlsx_mtime": xlsx_mtime,
         "row_count": len(df),
-        "embeddings": embeddings.tolist()
+        "normalized": True,
+        "dtype": np.dtype(EMBEDDINGS_STORAGE_DTYPE).name,
+        "hashes": hashes
     }
-    with open(EMBEDDINGS_CACHE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(cache_data, f)
+    _write_json_file(EMBEDDINGS_META_FILE, cache_meta)
     
-    print(f"[Embeddings] Cached {len(embeddings)} embeddings")
+    log.info("[Embeddings] Cached %d embeddings", len(embeddings))
+    _remember_embeddings(embeddings, xlsx_mtime, df)
     return embeddings, df
 
-def cosine_similarity_batch(query_vec: np.ndarray, all_vecs: np.ndarray) -> np.ndarray:
-    """Compute cosine similarity between query and all vectors."""
-    query_norm = np.linalg.norm(query_vec)
-    all_norms = np.linalg.norm(all_vecs, axis=1)
-    
-    if query_norm == 0 or np.any(all_norms == 0):
-        return np.zeros(len(all_vecs))
-    
-    dots = np.dot(all_vecs, query_vec)
-    return dots / (all_norms * query_norm)
+def _remember_embeddings(embeddings: np.ndarray, xlsx_mtime: float, df: pd.DataFrame) -> None:
+    """Keep the float32 working matrix in memory for subsequent requests."""
+    _embeddings_cache["embeddings"] = embeddings
+    _embeddings_cache["mtime"] = xlsx_mtime
+    _embeddings_cache["rows"] = len(embeddings)
+    # Single assignment so readers never see embeddings and rows from different loads
+    _embeddings_cache["snapshot"] = (embeddings, df)
+
+def get_portfolio_snapshot() -> tuple[np.ndarray, pd.DataFrame]:
+    """
+    Embeddings and their matching DataFrame for request handlers.
+    Returns the last fully built pair (kept fresh by the background refresher)
+    without touching Excel or the cache files; builds it on first use.
+    """
+    snapshot = _embeddings_cache["snapshot"]
+    if snapshot is None:
+        return load_or_create_embeddings()
+    return snapshot
+
+def _text_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Return a column as stripped strings (empty strings when missing)."""
+    if name not in df.columns:
+        return pd.Series([""] * len(df), index=df.index)
+    return df[name].fillna("").astype(str).str.strip()
+
+def _word_overlap_counts(query: str, token_sets: np.ndarray) -> np.ndarray:
+    """Count shared whitespace-separated words between `query` and each precomputed token set."""
+    query_words = set(query.split())
+    if not query_words:
+        return np.zeros(len(token_sets), dtype=np.int64)
+    return np.fromiter(
+        (len(query_words & tokens) for tokens in token_sets),
+        dtype=np.int64,
+        count=len(token_sets)
+    )
+
+def _token_sets(texts: pd.Series) -> np.ndarray:
+    """Split each text into a frozenset of words (object array aligned with row positions)."""
+    return np.array([frozenset(text.split()) for text in texts], dtype=object)
+
+# Binary bag-of-words over whitespace tokens (same tokens as str.split), so a sparse
+# row @ query dot product counts the distinct words they share
+_token_vectorizer = HashingVectorizer(
+    n_features=2**20, tokenizer=str.split, token_pattern=None, lowercase=False,
+    binary=True, norm=None, alternate_sign=False
+) if SKLEARN_AVAILABLE else None
+
+def _token_features(texts: pd.Series) -> Dict[str, Any]:
+    """Precompute keyword-overlap features: a sparse term matrix, or token sets without sklearn."""
+    if _token_vectorizer is not None:
+        return {"matrix": _token_vectorizer.transform(texts)}
+    return {"tokens": _token_sets(texts)}
+
+def _keyword_overlap(query: str, token_features: Dict[str, Any], idx: np.ndarray) -> np.ndarray:
+    """Distinct-word overlap between `query` and the rows at positions `idx`."""
+    matrix = token_features.get("matrix")
+    if matrix is None:
+        return _word_overlap_counts(query, token_features["tokens"][idx])
+    if not query.split():
+        return np.zeros(len(idx), dtype=np.int64)
+    query_vec = _token_vectorizer.transform([query])
+    return (matrix @ query_vec.T).toarray().ravel()[idx].astype(np.int64)
+
+def build_scoring_features(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Precompute the per-row text features used by score_rows_bulk (lowercased
+    columns, keyword-overlap matrices and static flags) so they are built once per portfolio
+    load instead of on every query. Kept outside the DataFrame so returned rows
+    stay JSON-serializable. All values are aligned with row positions in `df`.
+    """
+    industry_lc = _text_column(df, 'industry').str.lower().reset_index(drop=True)
+    technologies_lc = _text_column(df, 'technologies').str.lower().reset_index(drop=True)
+    return {
+        "industry_lc": industry_lc,
+        # distinct lowercased industry -> sorted row positions; far fewer keys than rows
+        "industry_index": {value: np.asarray(pos, dtype=np.int64) for value, pos in industry_lc.groupby(industry_lc, sort=False).indices.items()},
+        "industry_tokens": _token_features(industry_lc),
+        "technologies_lc": technologies_lc,
+        "technologies_tokens": _token_features(technologies_lc),
+        "business_case_lc": _text_column(df, 'business_case').str.lower().reset_index(drop=True),
+        "problem_lc": _text_column(df, 'problem_or_opportunity_statement').str.lower().reset_index(drop=True),
+        "has_value_add": (_text_column(df, VALUE_ADD_COLUMN).str.len() > 100).to_numpy(),
+        "has_results": (_text_column(df, 'key_deliverables').str.len() > 50).to_numpy(),
+        "is_active": (_text_column(df, 'status') == 'active').to_numpy(),
+    }
+
+def industry_candidates(features: Dict[str, Any], industry: str) -> np.ndarray:
+    """Row positions whose industry contains `industry` (case-insensitive), in row order."""
+    industry_lower = industry.lower()
+    groups = [pos for value, pos in features["industry_index"].items() if industry_lower in value]
+    if not groups:
+        return np.array([], dtype=np.int64)
+    return np.sort(np.concatenate(groups))
+
+def get_scoring_features(df: pd.DataFrame) -> Dict[str, Any]:
+    """Return cached scoring features for the loaded portfolio, building them for any other frame."""
+    snapshot = _portfolio_cache["snapshot"]
+    if snapshot is not None and snapshot[0] is df:
+        return snapshot[2]
+    return build_scoring_features(df)
+
+def _reasoning_bullets(
+    semantic_sim: float,
+    industry: Optional[str],
+    industry_full: bool,
+    industry_overlap: int,
+    technology: Optional[str],
+    tech_full: bool,
+    tech_overlap: int,
+    has_value_add: bool,
+    has_results: bool,
+    is_active: bool,
+    focus_hit: bool
+) -> List[str]:
+    """Build the bullet-point explanation for one scored row."""
+    bullets = [f"[OK] Semantic Match: {semantic_sim*100:.1f}% similarity to your requirements"]
+    if industry_full:
+        bullets.append(f"[OK] Industry Match: Direct alignment with '{industry}' sector")
+    elif industry_overlap > 0:
+        bullets.append(f"[OK] Industry Relevance: Partial match ({industry_overlap} keyword{'s' if industry_overlap > 1 else ''})")
+    if tech_full:
+        bullets.append(f"[OK] Technology Match: '{technology}' explicitly used in project")
+    elif tech_overlap > 0:
+        bullets.append(f"[OK] Technology Relevance: {tech_overlap} related technology keyword{'s' if tech_overlap > 1 else ''}")
+    if has_value_add:
+        bullets.append("[OK] Strong Value Proposition: Detailed solution description available")
+    if has_results:
+        bullets.append("[OK] Proven Results: Concrete deliverables documented")
+    if is_active:
+        bullets.append("[OK] Active Project: Currently ongoing, demonstrating recent capabilities")
+    if focus_hit:
+        bullets.append("[OK] Focus Area Alignment: Project addresses similar business challenges")
+    return bullets
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first. Uses an O(N) argpartition and
+    only sorts the k winners; equal scores are ordered by position.
+    """
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.array([], dtype=np.int64)
+    if k < n:
+        # argpartition picks arbitrarily among ties at the k-th score; keep everything above
+        # that boundary score and fill up with the lowest-position rows that equal it
+        boundary = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > boundary)
+        tied = np.flatnonzero(scores == boundary)[:k - len(above)]
+        idx = np.concatenate([above, tied])
+    else:
+        idx = np.arange(n)
+    return idx[np.lexsort((idx, -scores[idx]))]
 
-def score_row_with_reasoning(
-    row: pd.Series,
+def score_rows_bulk(
+    df: pd.DataFrame,
     query_embedding: np.ndarray,
-    row_embedding: np.ndarray,
-    client: str,
+    embeddings: np.ndarray,
     industry: Optional[str],
     technology: Optional[str],
-    focus: Optional[str]
-) -> Dict[str, Any]:
+    focus: Optional[str],
+    candidate_indices: Optional[List[int]] = None,
+    limit: int = 6,
+    features: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
     """
-    Enhanced scoring with bullet-point reasoning and percentage match scores.
-    Returns detailed explanation of WHY this row was selected.
+    Vectorized scoring with bullet-point reasoning and percentage match scores.
+    Scores every candidate row at once (one matmul + column-wise string ops) and
+    builds the detailed explanation of WHY a row was selected only for the top
+    `limit` rows returned, best match first.
+    Expects `query_embedding` and `embeddings` to be L2-normalized; `features`
+    defaults to the cached output of build_scoring_features for `df`.
+
+    Scoring (100 points max):
+      Semantic similarity 40, industry 20 (10 partial), technology 20 (10 partial),
+      business value 10, active project 5, focus area alignment 5.
     """
-    reasoning_bullets = []
-    match_score = 0
-    max_score = 100
-    
-    # 1. Semantic Similarity (40 points max)
-    semantic_sim = float(cosine_similarity_batch(query_embedding, row_embedding.reshape(1, -1))[0])
-    semantic_score = semantic_sim * 40
-    match_score += semantic_score
-    reasoning_bullets.append(f"[OK] Semantic Match: {semantic_sim*100:.1f}% similarity to your requirements")
-    
+    if candidate_indices is None:
+        candidate_indices = list(range(len(df)))
+    idx = np.asarray(candidate_indices, dtype=np.int64)
+    if len(idx) == 0:
+        return []
+    if features is None:
+        features = get_scoring_features(df)
+    n = len(idx)
+    no_match = np.zeros(n, dtype=bool)
+    no_overlap = np.zeros(n, dtype=np.int64)
+
+    # 1. Semantic Similarity (40 points max) - single BLAS call over unit vectors
+    semantic_sim = np.asarray(embeddings[idx] @ query_embedding, dtype=np.float64)
+    match_score = semantic_sim * 40
+
     # 2. Industry Alignment (20 points max)
-    row_industry = _safe_str(row.get('industry', '')).lower()
-    if industry and _safe_str(industry).lower() in row_industry:
-        industry_score = 20
-        match_score += industry_score
-        reasoning_bullets.append(f"[OK] Industry Match: Direct alignment with '{industry}' sector")
-    elif industry:
-        # Partial match
-        query_words = set(_safe_str(industry).lower().split())
-        row_words = set(row_industry.split())
-        overlap = len(query_words & row_words)
-        if overlap > 0:
-            industry_score = 10
-            match_score += industry_score
-            reasoning_bullets.append(f"[OK] Industry Relevance: Partial match ({overlap} keyword{'s' if overlap > 1 else ''})")
-    
+    industry_full, industry_overlap = no_match, no_overlap
+    if industry:
+        industry_query = _safe_str(industry).lower()
+        row_industry = features["industry_lc"].iloc[idx]
+        industry_full = row_industry.str.contains(industry_query, regex=False).to_numpy()
+        industry_overlap = np.where(industry_full, 0, _keyword_overlap(industry_query, features["industry_tokens"], idx))
+        match_score += np.where(industry_full, 20, np.where(industry_overlap > 0, 10, 0))
+
     # 3. Technology Match (20 points max)
-    row_tech = _safe_str(row.get('technologies', '')).lower()
+    tech_full, tech_overlap = no_match, no_overlap
     if technology:
         tech_query = _safe_str(technology).lower()
-        if tech_query in row_tech:
-            tech_score = 20
-            match_score += tech_score
-            reasoning_bullets.append(f"[OK] Technology Match: '{technology}' explicitly used in project")
-        else:
-            # Check for partial tech matches
-            tech_words = set(tech_query.split())
-            row_tech_words = set(row_tech.split())
-            overlap = len(tech_words & row_tech_words)
-            if overlap > 0:
-                tech_score = 10
-                match_score += tech_score
-                reasoning_bullets.append(f"[OK] Technology Relevance: {overlap} related technology keyword{'s' if overlap > 1 else ''}")
-    
+        row_tech = features["technologies_lc"].iloc[idx]
+        tech_full = row_tech.str.contains(tech_query, regex=False).to_numpy()
+        tech_overlap = np.where(tech_full, 0, _keyword_overlap(tech_query, features["technologies_tokens"], idx))
+        match_score += np.where(tech_full, 20, np.where(tech_overlap > 0, 10, 0))
+
     # 4. Business Value Indicators (10 points max)
-    value_add = _safe_str(row.get('evoke_solution_/_value_add_to_the_customer_(what_/_how)', ''))
-    results = _safe_str(row.get('key_deliverables', ''))
-    
-    value_score = 0
-    if len(value_add) > 100:
-        value_score += 5
-        reasoning_bullets.append("[OK] Strong Value Proposition: Detailed solution description available")
-    if len(results) > 50:
-        value_score += 5
-        reasoning_bullets.append("[OK] Proven Results: Concrete deliverables documented")
-    match_score += value_score
-    
+    has_value_add = features["has_value_add"][idx]
+    has_results = features["has_results"][idx]
+    match_score += has_value_add * 5 + has_results * 5
+
     # 5. Project Status Bonus (5 points max)
-    if row.get('status') == 'active':
-        match_score += 5
-        reasoning_bullets.append("[OK] Active Project: Currently ongoing, demonstrating recent capabilities")
-    
+    is_active = features["is_active"][idx]
+    match_score += is_active * 5
+
     # 6. Focus Area Alignment (5 points max)
+    focus_hit = no_match
     if focus:
-        focus_lower = _safe_str(focus).lower()
-        business_case = _safe_str(row.get('business_case', '')).lower()
-        problem_stmt = _safe_str(row.get('problem_or_opportunity_statement', '')).lower()
-        
-        focus_in_business = any(word in business_case for word in focus_lower.split() if len(word) > 3)
-        focus_in_problem = any(word in problem_stmt for word in focus_lower.split() if len(word) > 3)
-        
-        if focus_in_business or focus_in_problem:
-            match_score += 5
-            reasoning_bullets.append("[OK] Focus Area Alignment: Project addresses similar business challenges")
-    
-    # Calculate percentage
-    match_percentage = min(100, (match_score / max_score) * 100)
-    
-    # Build final reasoning summary
-    reasoning_summary = "\n".join(reasoning_bullets)
-    if not reasoning_bullets:
-        reasoning_summary = "- General portfolio relevance"
-    
-    return {
-        "match_score": round(match_percentage, 1),
-        "semantic_similarity": round(semantic_sim * 100, 1),
-        "detailed_reasoning": reasoning_summary,
-        "reasoning_bullets": reasoning_bullets,
-        "raw_score": round(match_score, 1)
-    }
+        focus_words = [word for word in _safe_str(focus).lower().split() if len(word) > 3]
+        if focus_words:
+            business_case = features["business_case_lc"].iloc[idx]
+            problem_stmt = features["problem_lc"].iloc[idx]
+            focus_hit = np.zeros(n, dtype=bool)
+            for word in focus_words:
+                focus_hit |= business_case.str.contains(word, regex=False).to_numpy()
+                focus_hit |= problem_stmt.str.contains(word, regex=False).to_numpy()
+            match_score += focus_hit * 5
+
+    # Calculate percentage and pick the top rows
+    match_percentage = np.round(np.minimum(100, match_score), 1)
+    order = top_k(match_percentage, limit)
+
+    top_matches = []
+    for pos in order:
+        reasoning_bullets = _reasoning_bullets(
+            semantic_sim=float(semantic_sim[pos]),
+            industry=industry,
+            industry_full=bool(industry_full[pos]),
+            industry_overlap=int(industry_overlap[pos]),
+            technology=technology,
+            tech_full=bool(tech_full[pos]),
+            tech_overlap=int(tech_overlap[pos]),
+            has_value_add=bool(has_value_add[pos]),
+            has_results=bool(has_results[pos]),
+            is_active=bool(is_active[pos]),
+            focus_hit=bool(focus_hit[pos])
+        )
+        row_dict = df.iloc[idx[pos]].to_dict()
+        row_dict.update({
+            "match_score": float(match_percentage[pos]),
+            "semantic_similarity": round(float(semantic_sim[pos]) * 100, 1),
+            "detailed_reasoning": "\n".join(reasoning_bullets),
+            "reasoning_bullets": reasoning_bullets,
+            "raw_score": round(float(match_score[pos]), 1)
+        })
+        top_matches.append(row_dict)
+
+    return top_matches
+
+def _search_query_cache_key(client: str, industry: Optional[str], focus: Optional[str]) -> str:
+    """Normalized cache key for a (client, industry, focus) combination."""
+    return "|".join(_safe_str(part).lower() for part in (client, industry, focus))
+
+def _search_query_cache_entries() -> Dict[str, Any]:
+    """Return the query cache, loading unexpired entries from disk on first use (caller holds the lock)."""
+    if _search_query_cache["entries"] is None:
+        entries = {}
+        if SEARCH_QUERY_CACHE_FILE.exists():
+            try:
+                now = time.time()
+                entries = {k: v for k, v in _read_json_file(SEARCH_QUERY_CACHE_FILE).items()
+                           if now - v.get("ts", 0) < SEARCH_QUERY_CACHE_TTL}
+            except Exception as e:
+                log.warning("[Query Cache] Cache read error: %s", e)
+        _search_query_cache["entries"] = entries
+    return _search_query_cache["entries"]
+
+def _get_cached_search_queries(key: str) -> Optional[List[str]]:
+    """Return cached queries for `key` if present and not expired."""
+    with _search_query_cache_lock:
+        entry = _search_query_cache_entries().get(key)
+        if entry and time.time() - entry["ts"] < SEARCH_QUERY_CACHE_TTL:
+            return list(entry["queries"])
+    return None
+
+def _store_search_queries(key: str, queries: List[str]) -> None:
+    """Cache queries for `key` and persist the cache to disk."""
+    with _search_query_cache_lock:
+        entries = _search_query_cache_entries()
+        entries.pop(key, None)
+        entries[key] = {"ts": time.time(), "queries": list(queries)}
+        # Evict oldest entries (dict keeps insertion order)
+        while len(entries) > SEARCH_QUERY_CACHE_MAX:
+            entries.pop(next(iter(entries)))
+        try:
+            _write_json_file(SEARCH_QUERY_CACHE_FILE, entries)
+        except Exception as e:
+            log.warning("[Query Cache] Cache write error: %s", e)
 
 def generate_search_queries_with_ai(client: str, industry: Optional[str], focus: Optional[str]) -> List[str]:
-    """Generate comprehensive search queries with enhanced fallback for maximum intelligence gathering."""
+    """Generate comprehensive search queries with enhanced fallback for maximum intelligence gathering.
+
+    AI-generated queries are cached per (client, industry, focus) for SEARCH_QUERY_CACHE_TTL seconds;
+    fallback queries are cheap to rebuild and are never cached.
+    """
     # Enhanced fallback queries - always use these for reliability
     comprehensive_queries = [
         # Financial Intelligence
@@ -392,11 +854,17 @@ def generate_search_queries_with_ai(client: str, industry: Optional[str], focus:
     
     # Try AI enhancement but fallback to comprehensive queries
     if not OPENAI_API_KEY:
-        print(f"[Query Gen] Using comprehensive fallback queries ({len(comprehensive_queries)} queries)")
+        log.info("[Query Gen] Using comprehensive fallback queries (%d queries)", len(comprehensive_queries))
         return comprehensive_queries
     
+    cache_key = _search_query_cache_key(client, industry, focus)
+    cached_queries = _get_cached_search_queries(cache_key)
+    if cached_queries:
+        log.info("[AI Query Gen] Reusing %d cached queries", len(cached_queries))
+        return cached_queries
+    
     try:
-        ai_client = OpenAI(api_key=OPENAI_API_KEY)
+        ai_client = _openai_client()
         
         prompt = f"""Generate 25-30 highly targeted search queries to comprehensively research this company for presales intelligence:
 
@@ -452,77 +920,111 @@ Example: ['"Apple Inc" latest quarterly earnings", '"Apple Inc" cloud infrastruc
             try:
                 queries = json.loads(content)
                 if isinstance(queries, list) and len(queries) > 0:
-                    print(f"[AI Query Gen] Generated {len(queries)} AI-enhanced queries")
+                    log.info("[AI Query Gen] Generated %d AI-enhanced queries", len(queries))
+                    _store_search_queries(cache_key, queries)
                     return queries
             except json.JSONDecodeError:
-                print(f"[AI Query Gen] JSON parse failed, using enhanced fallback")
+                log.warning("[AI Query Gen] JSON parse failed, using enhanced fallback")
         
-        print(f"[AI Query Gen] Using comprehensive fallback queries")
+        log.info("[AI Query Gen] Using comprehensive fallback queries")
         return comprehensive_queries
     
     except Exception as e:
-        print(f"[AI Query Gen] Error: {e}, using enhanced fallback queries")
+        log.warning("[AI Query Gen] Error: %s, using enhanced fallback queries", e)
         return comprehensive_queries
 
+# One long-lived DDGS client per worker thread, so cookies and connections are reused
+# across queries without sharing a client between concurrent searches
+_ddgs_local = threading.local()
+
+def _get_ddgs():
+    """Return this thread's DDGS client, creating it on first use."""
+    client = getattr(_ddgs_local, "client", None)
+    if client is None:
+        client = DDGS()
+        _ddgs_local.client = client
+    return client
+
+class _RateLimiter:
+    """Thread-safe minimum spacing between calls to one search engine."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        """Block until this caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+_engine_limiters = {name: _RateLimiter(interval) for name, interval in SEARCH_ENGINE_MIN_INTERVAL.items()}
+
 def duckduckgo_search(query: str, max_results: int = 8, retries: int = 3) -> List[Dict[str, str]]:
     """Enhanced DuckDuckGo search with retry logic and better error handling."""
     if not DDGS_AVAILABLE:
-        print("[DuckDuckGo] ERROR Library not available")
+        log.error("[DuckDuckGo] Library not available")
         return []
         
     for attempt in range(retries):
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, max_results=max_results))
-                formatted_results = []
+            _engine_limiters["duckduckgo"].wait()
+            results = list(_get_ddgs().text(query, max_results=max_results))
+            formatted_results = []
+            
+            for result in results:
+                # Enhanced validation of result data
+                title = result.get("title", "").strip()
+                body = result.get("body", "").strip()
+                url = result.get("href", "").strip()
                 
-                for result in results:
-                    # Enhanced validation of result data
-                    title = result.get("title", "").strip()
-                    body = result.get("body", "").strip()
-                    url = result.get("href", "").strip()
-                    
-                    # Skip results with missing critical data
-                    if not title or not url or len(body) < 20:
-                        continue
-                        
-                    formatted_results.append({
-                        "source": "DuckDuckGo Search",
-                        "query": query,
-                        "title": title,
-                        "snippet": body,
-                        "url": url,
-                        "category": "web_search"
-                    })
+                # Skip results with missing critical data
+                if not title or not url or len(body) < 20:
+                    continue
                     
-                print(f"[DuckDuckGo] SUCCESS Found {len(formatted_results)} quality results")
-                return formatted_results
+                formatted_results.append({
+                    "source": "DuckDuckGo Search",
+                    "query": query,
+                    "title": title,
+                    "snippet": body,
+                    "url": url,
+                    "category": "web_search"
+                })
                 
+            log.info("[DuckDuckGo] Found %d quality results", len(formatted_results))
+            return formatted_results
+            
         except Exception as e:
+            # Drop the session so the retry starts from a clean client
+            _ddgs_local.client = None
             error_msg = str(e).lower()
             if "rate" in error_msg or "limit" in error_msg:
-                print(f"[DuckDuckGo] WARNING Rate limited on attempt {attempt + 1}")
+                log.warning("[DuckDuckGo] Rate limited on attempt %d", attempt + 1)
                 wait_time = 5 + (2 ** attempt)  # Longer wait for rate limits
             else:
-                print(f"[DuckDuckGo] ERROR Attempt {attempt + 1} failed: {str(e)[:100]}")
+                log.warning("[DuckDuckGo] Attempt %d failed: %.100s", attempt + 1, e)
                 wait_time = 2 ** attempt
                 
             if attempt < retries - 1:
-                print(f"[DuckDuckGo] RETRYING in {wait_time} seconds...")
+                log.info("[DuckDuckGo] Retrying in %s seconds...", wait_time)
                 time.sleep(wait_time)
                     
-    print(f"[DuckDuckGo] ERROR All {retries} attempts failed for query")
+    log.error("[DuckDuckGo] All %d attempts failed for query", retries)
     return []
 
 def free_google_search(query: str, max_results: int = 5) -> List[Dict[str, str]]:
     """Enhanced free Google search with better error handling."""
     if not GOOGLE_SEARCH_AVAILABLE:
-        print("[Google] ERROR Library not available")
+        log.error("[Google] Library not available")
         return []
         
     try:
-        # Add delay to avoid being blocked
-        time.sleep(1)
+        # Space out requests across concurrent queries to avoid being blocked
+        _engine_limiters["google"].wait()
         
         results = list(google_search(query, num_results=max_results))
         formatted_results = []
@@ -542,23 +1044,23 @@ def free_google_search(query: str, max_results: int = 5) -> List[Dict[str, str]]
                     "category": "web_search"
                 })
             
-        print(f"[Google] SUCCESS Found {len(formatted_results)} results")
+        log.info("[Google] Found %d results", len(formatted_results))
         return formatted_results
         
     except Exception as e:
         error_msg = str(e).lower()
         if "429" in error_msg or "too many requests" in error_msg:
-            print(f"[Google] WARNING Rate limited - {str(e)[:100]}")
+            log.warning("[Google] Rate limited - %.100s", e)
         elif "403" in error_msg or "blocked" in error_msg:
-            print(f"[Google] WARNING Access blocked - {str(e)[:100]}")
+            log.warning("[Google] Access blocked - %.100s", e)
         else:
-            print(f"[Google] ERROR Search failed: {str(e)[:100]}")
+            log.error("[Google] Search failed: %.100s", e)
         return []
 
 def serpapi_search(query: str, max_results: int = 5) -> List[Dict[str, str]]:
     """Enhanced SERP API search with comprehensive error handling."""
     if not SERPAPI_API_KEY:
-        print("[SERP] ERROR API key not available")
+        log.error("[SERP] API key not available")
         return []
         
     params = {
@@ -571,16 +1073,17 @@ def serpapi_search(query: str, max_results: int = 5) -> List[Dict[str, str]]:
     }
     
     try:
-        response = requests.get("https://serpapi.com/search", params=params, timeout=20)
+        _engine_limiters["serpapi"].wait()
+        response = _serp_session.get("https://serpapi.com/search", params=params, timeout=20)
         
         if response.status_code == 429:
-            print(f"[SERP] WARNING Rate limit hit - daily quota exceeded")
+            log.warning("[SERP] Rate limit hit - daily quota exceeded")
             return []
         elif response.status_code == 401:
-            print(f"[SERP] ERROR Authentication failed - check API key")
+            log.error("[SERP] Authentication failed - check API key")
             return []
         elif response.status_code == 403:
-            print(f"[SERP] ERROR Access forbidden - API key may be invalid")
+            log.error("[SERP] Access forbidden - API key may be invalid")
             return []
             
         response.raise_for_status()
@@ -588,7 +1091,7 @@ def serpapi_search(query: str, max_results: int = 5) -> List[Dict[str, str]]:
         
         # Check for API-specific errors
         if "error" in data:
-            print(f"[SERP] ERROR API error: {data['error']}")
+            log.error("[SERP] API error: %s", data['error'])
             return []
         
         formatted_results = []
@@ -610,110 +1113,127 @@ def serpapi_search(query: str, max_results: int = 5) -> List[Dict[str, str]]:
                     "category": "web_search"
                 })
             
-        print(f"[SERP] SUCCESS Found {len(formatted_results)} quality results")
+        log.info("[SERP] Found %d quality results", len(formatted_results))
         return formatted_results
         
     except requests.exceptions.Timeout:
-        print(f"[SERP] WARNING Request timeout after 20 seconds")
+        log.warning("[SERP] Request timeout after 20 seconds")
         return []
     except requests.exceptions.RequestException as e:
-        print(f"[SERP] ERROR Network error: {str(e)[:100]}")
+        log.error("[SERP] Network error: %.100s", e)
         return []
     except Exception as e:
-        print(f"[SERP] ERROR Unexpected error: {str(e)[:100]}")
+        log.error("[SERP] Unexpected error: %.100s", e)
         return []
 
-def intelligent_cascade_search(query: str, target_results: int = 8) -> List[Dict[str, str]]:
+def _canonical_url(url: str) -> str:
+    """Dedupe key for a result URL: lowercased scheme/host, path without trailing slash, no query/fragment."""
+    parsed = urlparse(url.strip())
+    if not parsed.netloc:
+        return ""
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+
+async def cascade_async(query: str, target_results: int = 8) -> List[Dict[str, str]]:
     """
-    Intelligent search that cascades through engines until target results achieved.
-    Priority: DuckDuckGo -> Google -> SerpAPI (based on rate limits and reliability)
+    Concurrent engine cascade. The free engines (DuckDuckGo, Google) are queried in
+    parallel and merged (deduplicated by URL) as they finish; engines still pending are
+    cancelled once target_results is reached. SerpAPI stays the paid fallback and is only
+    queried when the free engines return less than 70% of the target.
     """
     all_results = []
+    seen_urls = set()
     
-    # Define search engines in priority order
-    search_engines = [
-        {
-            "name": "duckduckgo",
-            "func": duckduckgo_search,
-            "max_results": target_results,
-            "delay": 1,
-            "description": "Primary free engine"
-        },
-        {
-            "name": "google", 
-            "func": free_google_search,
-            "max_results": min(target_results, 5),  # Google has stricter limits
-            "delay": 2,
-            "description": "Secondary free engine"
-        },
-        {
-            "name": "serpapi",
-            "func": serpapi_search, 
-            "max_results": min(target_results, 5),
-            "delay": 1,
-            "description": "Premium API fallback"
-        }
-    ]
+    def merge(engine_name: str, engine_results: List[Dict[str, str]]) -> None:
+        new_results = []
+        for r in engine_results:
+            key = _canonical_url(r.get("url", ""))
+            if key and key not in seen_urls:
+                seen_urls.add(key)
+                new_results.append(r)
+        all_results.extend(new_results)
+        log.info("[Intelligent Search] %s added %d unique results (total: %d)", engine_name, len(new_results), len(all_results))
     
-    print(f"[Intelligent Search] Target: {target_results} results for '{query[:50]}...'")
+    log.info("[Intelligent Search] Target: %d results for '%.50s...'", target_results, query)
     
-    for engine in search_engines:
-        # Skip if we already have enough results
-        if len(all_results) >= target_results:
-            print(f"[Intelligent Search] Target achieved with {len(all_results)} results")
-            break
-            
-        # Skip SerpAPI if rate limited (check for API key)
-        if engine["name"] == "serpapi" and not SERPAPI_API_KEY:
-            print(f"[Intelligent Search] Skipping {engine['name']} - no API key")
-            continue
-            
-        # Skip Google/DDG if they're not available
-        if engine["name"] == "google" and not GOOGLE_SEARCH_AVAILABLE:
-            print(f"[Intelligent Search] Skipping {engine['name']} - library not available")
-            continue
-            
-        if engine["name"] == "duckduckgo" and not DDGS_AVAILABLE:
-            print(f"[Intelligent Search] Skipping {engine['name']} - library not available")
+    # Free engines run concurrently (blocking libraries are offloaded to threads)
+    loop = asyncio.get_running_loop()
+    free_engines = [
+        ("duckduckgo", DDGS_AVAILABLE, duckduckgo_search, target_results),
+        ("google", GOOGLE_SEARCH_AVAILABLE, free_google_search, min(target_results, 5)),  # Google has stricter limits
+    ]
+    tasks = {}
+    for name, available, func, max_results in free_engines:
+        if not available:
+            log.debug("[Intelligent Search] Skipping %s - library not available", name)
             continue
-        
-        remaining_needed = target_results - len(all_results)
-        search_limit = min(engine["max_results"], remaining_needed + 2)  # Get a few extra
-        
-        print(f"[Intelligent Search] Trying {engine['name']} ({engine['description']}) - need {remaining_needed} more")
-        
-        try:
-            engine_results = engine["func"](query, search_limit)
-            
+        tasks[asyncio.ensure_future(loop.run_in_executor(_search_executor, func, query, max_results))] = name
+    
+    pending = set(tasks)
+    while pending and len(all_results) < target_results:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            name = tasks[task]
+            try:
+                engine_results = task.result()
+            except Exception as e:
+                log.warning("[Intelligent Search] %s failed: %.100s...", name, e)
+                continue
             if engine_results:
-                # Filter out duplicates by URL
-                existing_urls = {result.get("url", "") for result in all_results}
-                new_results = [r for r in engine_results if r.get("url", "") not in existing_urls]
-                
-                all_results.extend(new_results)
-                print(f"[Intelligent Search] SUCCESS {engine['name']} added {len(new_results)} unique results (total: {len(all_results)})")
-                
-                # If we got good results, no need to try more engines unless we're still short
-                if len(all_results) >= target_results * 0.7:  # 70% of target from primary engines
-                    print(f"[Intelligent Search] Sufficient results from {engine['name']}, stopping cascade")
-                    break
+                merge(name, engine_results)
             else:
-                print(f"[Intelligent Search] ERROR {engine['name']} returned no results")
-                
-        except Exception as e:
-            print(f"[Intelligent Search] ERROR {engine['name']} failed: {str(e)[:100]}...")
-            continue
-            
-        # Rate limiting delay between engines
-        time.sleep(engine["delay"])
+                log.info("[Intelligent Search] %s returned no results", name)
+    
+    if pending:
+        log.info("[Intelligent Search] Target achieved with %d results, cancelling %d pending engine(s)", len(all_results), len(pending))
+        for task in pending:
+            task.cancel()
+    
+    # Premium API fallback only when the free engines fell short
+    if len(all_results) < target_results * 0.7:
+        if not SERPAPI_API_KEY:
+            log.debug("[Intelligent Search] Skipping serpapi - no API key")
+        else:
+            remaining_needed = target_results - len(all_results)
+            log.info("[Intelligent Search] Trying serpapi (Premium API fallback) - need %d more", remaining_needed)
+            try:
+                serp_results = await loop.run_in_executor(_search_executor, serpapi_search, query, min(target_results, 5))
+                if serp_results:
+                    merge("serpapi", serp_results)
+                else:
+                    log.info("[Intelligent Search] serpapi returned no results")
+            except Exception as e:
+                log.warning("[Intelligent Search] serpapi failed: %.100s...", e)
     
-    print(f"[Intelligent Search] Final result: {len(all_results)} items from cascade search")
+    log.info("[Intelligent Search] Final result: %d items from cascade search", len(all_results))
     return all_results
 
+def intelligent_cascade_search(query: str, target_results: int = 8) -> List[Dict[str, str]]:
+    """
+    Intelligent search across engines until target results achieved.
+    Synchronous wrapper around cascade_async: DuckDuckGo + Google concurrently, SerpAPI as fallback.
+    """
+    return asyncio.run(cascade_async(query, target_results))
+
 def multi_engine_search(query: str, max_results_per_engine: int = 3) -> List[Dict[str, str]]:
     """Legacy multi-engine search - now calls intelligent cascade for better results."""
     return intelligent_cascade_search(query, target_results=max_results_per_engine * 2)
 
+# Content-type keywords for search results; URLs and titles carry different hints
+_URL_CATEGORY_RE = re.compile(r"(?P<financial>yahoo|finance)|(?P<leadership>linkedin)")
+_TITLE_CATEGORY_RE = re.compile(r"(?P<financial>investor)|(?P<leadership>executive|leadership)|(?P<news>press|news|announcement)")
+_CATEGORY_PRIORITY = ("financial", "leadership", "news")
+
+def _classify_search_result(url: str, title: str, client_lower: str) -> str:
+    """Categorize a result from its lowercased URL and title (one regex scan per field)."""
+    found = {m.lastgroup for m in _URL_CATEGORY_RE.finditer(url)}
+    found.update(m.lastgroup for m in _TITLE_CATEGORY_RE.finditer(title))
+    for category in _CATEGORY_PRIORITY:
+        if category in found:
+            return category
+    if client_lower in url or "about" in url:
+        return "company_info"
+    return "general"
+
 def validate_search_quality(all_results: List[Dict[str, str]], client: str, target_categories: int = 5) -> Dict[str, Any]:
     """
     Validate search result quality and suggest improvements.
@@ -728,27 +1248,15 @@ def validate_search_quality(all_results: List[Dict[str, str]], client: str, targ
         }
     
     # Analyze result categories
-    categories = set()
-    for result in all_results:
-        source = result.get("source", "").lower()
-        url = result.get("url", "").lower()
-        title = result.get("title", "").lower()
-        
-        # Categorize by content type
-        if "yahoo" in url or "finance" in url or "investor" in title:
-            categories.add("financial")
-        elif "linkedin" in url or "executive" in title or "leadership" in title:
-            categories.add("leadership")
-        elif "press" in title or "news" in title or "announcement" in title:
-            categories.add("news")
-        elif client.lower() in url or "about" in url:
-            categories.add("company_info")
-        else:
-            categories.add("general")
+    client_lower = client.lower()
+    categories = {
+        _classify_search_result(result.get("url", "").lower(), result.get("title", "").lower(), client_lower)
+        for result in all_results
+    }
     
     # Calculate quality metrics
     unique_urls = len(set(r.get("url", "") for r in all_results))
-    avg_snippet_length = sum(len(r.get("snippet", "")) for r in all_results) / max(len(all_results), 1)
+    avg_snippet_length = float(np.fromiter((len(r.get("snippet", "")) for r in all_results), dtype=np.int64).mean())
     
     # Quality scoring
     quality_score = min(1.0, (
@@ -779,217 +1287,279 @@ def validate_search_quality(all_results: List[Dict[str, str]], client: str, targ
         "recommendations": recommendations
     }
 
-def comprehensive_web_search(client: str, industry: Optional[str] = None, focus: Optional[str] = None, 
-                            company_website: Optional[str] = None) -> str:
-    """Enhanced comprehensive intelligence gathering with maximum data extraction."""
-    print(f"[Web Search] Starting comprehensive intelligence gathering for {client}...")
+def search_single_query(query: str) -> List[Dict[str, str]]:
+    """Run one query through the engine(s) selected by SEARCH_ENGINE_PREFERENCE."""
+    query_results = []
     
-    all_results = []
-    
-    # Generate AI-powered search queries
-    search_queries = generate_search_queries_with_ai(client, industry, focus)
-    print(f"[Web Search] Generated {len(search_queries)} comprehensive search queries")
-    
-    # Multi-engine web search with intelligent fallbacks
-    print(f"[Web Search] Using search engine preference: {SEARCH_ENGINE_PREFERENCE}")
-    
-    # Process search queries with enhanced strategy
-    max_queries = min(10, len(search_queries))  # Process up to 10 queries
-    for i, query in enumerate(search_queries[:max_queries]):
-        print(f"[Web Search] Processing query {i+1}/{max_queries}: {query}")
+    if SEARCH_ENGINE_PREFERENCE == "intelligent_mixed":
+        # Use intelligent cascade search for best results
+        query_results = intelligent_cascade_search(query, target_results=8)
         
-        query_results = []
+    elif SEARCH_ENGINE_PREFERENCE == "mixed":
+        # Use traditional multi-engine approach
+        query_results = multi_engine_search(query, max_results_per_engine=3)
         
-        if SEARCH_ENGINE_PREFERENCE == "intelligent_mixed":
-            # Use intelligent cascade search for best results
+    elif SEARCH_ENGINE_PREFERENCE == "duckduckgo":
+        # Primary: DuckDuckGo, Fallback: Intelligent cascade if DDG fails
+        query_results = duckduckgo_search(query, max_results=8)
+        if len(query_results) < 3:  # If DDG fails or returns few results
+            log.info("[Fallback] DuckDuckGo insufficient (%d results), cascading to other engines", len(query_results))
+            cascade_results = intelligent_cascade_search(query, target_results=8)
+            # Merge results, avoiding duplicates
+            seen_urls = {_canonical_url(r.get("url", "")) for r in query_results}
+            query_results.extend(r for r in cascade_results if _canonical_url(r.get("url", "")) not in seen_urls)
+        
+    elif SEARCH_ENGINE_PREFERENCE == "google":
+        # Primary: Google, Fallback: Intelligent cascade if Google fails
+        query_results = free_google_search(query, max_results=5)
+        if len(query_results) < 2:
+            log.info("[Fallback] Google insufficient (%d results), cascading to other engines", len(query_results))
             query_results = intelligent_cascade_search(query, target_results=8)
-            
-        elif SEARCH_ENGINE_PREFERENCE == "mixed":
-            # Use traditional multi-engine approach
-            query_results = multi_engine_search(query, max_results_per_engine=3)
-            
-        elif SEARCH_ENGINE_PREFERENCE == "duckduckgo":
-            # Primary: DuckDuckGo, Fallback: Intelligent cascade if DDG fails
-            query_results = duckduckgo_search(query, max_results=8)
-            if len(query_results) < 3:  # If DDG fails or returns few results
-                print(f"[Fallback] DuckDuckGo insufficient ({len(query_results)} results), cascading to other engines")
-                cascade_results = intelligent_cascade_search(query, target_results=8)
-                # Merge results, avoiding duplicates
-                existing_urls = {r.get("url", "") for r in query_results}
-                additional_results = [r for r in cascade_results if r.get("url", "") not in existing_urls]
-                query_results.extend(additional_results)
-            
-        elif SEARCH_ENGINE_PREFERENCE == "google":
-            # Primary: Google, Fallback: Intelligent cascade if Google fails
-            query_results = free_google_search(query, max_results=5)
-            if len(query_results) < 2:
-                print(f"[Fallback] Google insufficient ({len(query_results)} results), cascading to other engines")
-                query_results = intelligent_cascade_search(query, target_results=8)
-            
-        elif SEARCH_ENGINE_PREFERENCE == "serpapi":
-            # Primary: SerpAPI, Fallback: Intelligent cascade if SerpAPI fails
-            query_results = serpapi_search(query, max_results=5)
-            if len(query_results) < 2:
-                print(f"[Fallback] SerpAPI insufficient ({len(query_results)} results), cascading to other engines")
-                query_results = intelligent_cascade_search(query, target_results=8)
-            
-        else:
-            # Default fallback to intelligent mixed mode
-            print(f"[Search] Unknown preference '{SEARCH_ENGINE_PREFERENCE}', using intelligent_mixed")
+        
+    elif SEARCH_ENGINE_PREFERENCE == "serpapi":
+        # Primary: SerpAPI, Fallback: Intelligent cascade if SerpAPI fails
+        query_results = serpapi_search(query, max_results=5)
+        if len(query_results) < 2:
+            log.info("[Fallback] SerpAPI insufficient (%d results), cascading to other engines", len(query_results))
             query_results = intelligent_cascade_search(query, target_results=8)
         
-        # Add results to main collection
+    else:
+        # Default fallback to intelligent mixed mode
+        log.warning("[Search] Unknown preference '%s', using intelligent_mixed", SEARCH_ENGINE_PREFERENCE)
+        query_results = intelligent_cascade_search(query, target_results=8)
+    
+    return query_results
+
+async def _search_queries_concurrently(queries: List[str]) -> List[Dict[str, str]]:
+    """Fan out queries concurrently (bounded by SEARCH_QUERY_CONCURRENCY), results kept in query order."""
+    sem = asyncio.Semaphore(SEARCH_QUERY_CONCURRENCY)
+    
+    async def run_query(i: int, query: str) -> List[Dict[str, str]]:
+        async with sem:
+            log.debug("[Web Search] Processing query %d/%d: %s", i + 1, len(queries), query)
+            if SEARCH_ENGINE_PREFERENCE == "intelligent_mixed":
+                return await cascade_async(query, target_results=8)
+            # search_single_query may cascade and submit engine calls to _search_executor itself,
+            # so it runs on the default executor; parents waiting there cannot starve the leaf pool
+            return await asyncio.to_thread(search_single_query, query)
+    
+    per_query = await asyncio.gather(*(run_query(i, q) for i, q in enumerate(queries)), return_exceptions=True)
+    
+    all_results = []
+    for query, query_results in zip(queries, per_query):
+        if isinstance(query_results, Exception):
+            log.warning("[Web Search] Query failed '%.50s': %.100s", query, query_results)
+            continue
         all_results.extend(query_results)
-        
-        # Enhanced delay to avoid rate limits - increase delay between queries
-        time.sleep(2)  # Increased from 1 to 2 seconds to avoid rate limiting
+    return all_results
+
+# Yahoo Finance pages are only mined for <span>/<table> text, so parse just those subtrees
+_FINANCE_STRAINER = SoupStrainer(["span", "table"])
+
+# Financial keywords a Yahoo <span> must mention to be kept (the ticker page skips dividends)
+_FINANCIAL_TERMS_RE = re.compile(r"revenue|market cap|pe ratio|earnings|dividend", re.IGNORECASE)
+_TICKER_FINANCIAL_TERMS_RE = re.compile(r"revenue|market cap|pe ratio|earnings", re.IGNORECASE)
+
+def _extract_financial_text(html: bytes, terms_re: re.Pattern, include_tables: bool) -> tuple[List[str], str]:
+    """
+    Pull financial snippets from a Yahoo Finance page: text of the first 100 <span>s that
+    match `terms_re`, then (optionally) compact text of the first 10 <table>s under 1000 chars.
+    Also returns all span/table text as a fallback snippet. Walks the tree with lxml directly
+    when available (no BeautifulSoup Tag wrappers), else uses the strained BeautifulSoup parse.
+    """
+    if LXML_AVAILABLE:
+        tree = lxml.html.document_fromstring(html)
+        span_texts = [span.text_content() for span in islice(tree.iter('span'), 100)]
+        table_texts = [" | ".join(t.strip() for t in table.itertext() if t.strip())
+                       for table in islice(tree.iter('table'), 10)] if include_tables else []
+        fallback_text = "".join(tree.xpath("//span//text() | //table//text()"))
+    else:
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=_FINANCE_STRAINER)
+        span_texts = [span.text for span in soup.find_all('span', limit=100)]
+        table_texts = [table.get_text(separator=' | ', strip=True)
+                       for table in soup.find_all('table', limit=10)] if include_tables else []
+        fallback_text = soup.get_text()
+
+    sections = [text.strip() for text in span_texts if text and terms_re.search(text)]
+    sections.extend(text for text in table_texts if text and len(text) < 1000)
+    return sections, fallback_text
+
+def _lookup_ticker(client: str) -> str:
+    """Ask the model for the client's stock ticker ("UNKNOWN" if private), cached per client for TICKER_CACHE_TTL."""
+    key = _safe_str(client).lower()
+    with _ticker_cache_lock:
+        entry = _ticker_cache.get(key)
+        if entry and time.time() - entry[0] < TICKER_CACHE_TTL:
+            return entry[1]
+
+    client_ai = _openai_client()
+    ticker_prompt = f"""What is the stock ticker symbol for "{client}"? 
+                
+Return ONLY the ticker symbol (like AAPL, MSFT, TSLA) or "UNKNOWN" if not a public company.
+Do not include any explanation."""
+    
+    ticker_response = client_ai.chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[{"role": "user", "content": ticker_prompt}],
+        max_tokens=20,
+        temperature=0.1
+    )
+    ticker = ticker_response.choices[0].message.content.strip()
     
-    # Auto-detect and scrape Yahoo Finance data
+    with _ticker_cache_lock:
+        _ticker_cache[key] = (time.time(), ticker)
+        while len(_ticker_cache) > TICKER_CACHE_MAX:
+            _ticker_cache.pop(next(iter(_ticker_cache)))
+    return ticker
+
+# One search result in the intelligence text handed to the model
+_SEARCH_RESULT_TEMPLATE = "Title: {title}\nContent: {snippet}\nSource: {source}\nURL: {url}\nQuery Context: {query}"
+
+async def _cascade_queries_concurrently(queries: List[str], target_results: int) -> List[Any]:
+    """Run cascade_async for every query at once; results (or exceptions) keep query order."""
+    return await asyncio.gather(*(cascade_async(q, target_results) for q in queries), return_exceptions=True)
+
+def _fetch_page(url: str, timeout: int) -> Optional[bytes]:
+    """GET `url` and return at most MAX_PAGE_BYTES of its body; None on network errors or non-200 responses.
+
+    The body is streamed so large pages (mostly inline JS we never parse) stop downloading at the cap.
+    """
+    try:
+        with _http_session.get(url, timeout=timeout, stream=True) as response:
+            if response.status_code != 200:
+                return None
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                body.extend(chunk)
+                if len(body) >= MAX_PAGE_BYTES:
+                    break
+            return bytes(body[:MAX_PAGE_BYTES])
+    except requests.RequestException:
+        return None
+
+async def _run_blocking_all(func, calls: List[tuple]) -> List[Any]:
+    """Run blocking `func(*args)` for every args tuple on the search pool at once.
+
+    Results keep input order; a call that raised yields its exception instead.
+    """
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*(loop.run_in_executor(_search_executor, func, *args) for args in calls),
+                                return_exceptions=True)
+
+def _scrape_yahoo_finance(client: str) -> List[Dict[str, str]]:
+    """Auto-detect the client's Yahoo Finance quote page (search first, AI ticker guess as fallback) and scrape it."""
+    results = []
     try:
-        print(f"[Yahoo Auto] Searching for Yahoo Finance data for {client}")
+        log.info("[Yahoo Auto] Searching for Yahoo Finance data for %s", client)
         
         # Try to find Yahoo Finance URL using free search engines
         yahoo_query = f'site:finance.yahoo.com "{client}" stock financial data'
         yahoo_results = []
+        yahoo_scraped = False
         
         # Try DuckDuckGo first for Yahoo Finance search
         if DDGS_AVAILABLE:
             try:
-                print(f"[Yahoo Auto] Trying DuckDuckGo search for Yahoo Finance")
+                log.info("[Yahoo Auto] Trying DuckDuckGo search for Yahoo Finance")
                 yahoo_ddg_results = duckduckgo_search(yahoo_query, max_results=3)
                 yahoo_results.extend(yahoo_ddg_results)
             except Exception as e:
-                print(f"[Yahoo Auto] DuckDuckGo search failed: {e}")
+                log.warning("[Yahoo Auto] DuckDuckGo search failed: %s", e)
         
         # If no results from DuckDuckGo, try free Google search
         if not yahoo_results and GOOGLE_SEARCH_AVAILABLE:
             try:
-                print(f"[Yahoo Auto] Trying Google search for Yahoo Finance")
+                log.info("[Yahoo Auto] Trying Google search for Yahoo Finance")
                 yahoo_google_results = free_google_search(yahoo_query, max_results=3)
                 yahoo_results.extend(yahoo_google_results)
             except Exception as e:
-                print(f"[Yahoo Auto] Google search failed: {e}")
+                log.warning("[Yahoo Auto] Google search failed: %s", e)
         
         # Fallback to SERP API only if other methods failed
         if not yahoo_results and SERPAPI_API_KEY:
             try:
-                print(f"[Yahoo Auto] Trying SERP API as fallback")
+                log.info("[Yahoo Auto] Trying SERP API as fallback")
                 yahoo_results = serpapi_search(yahoo_query, max_results=3)
             except Exception as e:
-                print(f"[Yahoo Auto] SERP API search failed: {e}")
+                log.warning("[Yahoo Auto] SERP API search failed: %s", e)
                 
         # Look for Yahoo Finance URLs in search results
         for result in yahoo_results:
             link = result.get("url", "") or result.get("link", "")
             if "finance.yahoo.com" in link and "/quote/" in link:
                 try:
-                    print(f"[Yahoo Auto] Found Yahoo Finance URL: {link}")
+                    log.info("[Yahoo Auto] Found Yahoo Finance URL: %s", link)
                     
                     # Scrape the detected Yahoo Finance page
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                    }
-                    response = requests.get(link, headers=headers, timeout=15)
-                    response.raise_for_status()
+                    html = _fetch_page(link, 15)
+                    if html is None:
+                        raise requests.HTTPError(f"Could not fetch {link}")
                     
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Extract comprehensive financial data
-                    financial_sections = []
-                    
-                    # Key statistics
-                    for span in soup.find_all('span', limit=100):
-                        if span.text and any(term in span.text.lower() for term in ['revenue', 'market cap', 'pe ratio', 'earnings', 'dividend']):
-                            financial_sections.append(span.text.strip())
-                    
-                    # Financial tables
-                    for table in soup.find_all('table', limit=10):
-                        table_text = table.get_text(separator=' | ', strip=True)
-                        if table_text and len(table_text) < 1000:
-                            financial_sections.append(table_text)
+                    # Extract comprehensive financial data (key statistics + financial tables)
+                    financial_sections, page_text = _extract_financial_text(html, _FINANCIAL_TERMS_RE, include_tables=True)
                     
                     financial_content = "\n\n".join(financial_sections[:10])
                     
-                    all_results.append({
+                    results.append({
                         "source": "Yahoo Finance (Auto-detected)",
                         "query": "auto_financial_data",
                         "title": f"{client} Auto-detected Financial Data",
-                        "snippet": financial_content or soup.get_text()[:2500],
+                        "snippet": financial_content or page_text[:2500],
                         "url": link,
                         "category": "financial"
                     })
                     
-                    print(f"[Yahoo Auto] Successfully scraped financial data from {link}")
+                    log.info("[Yahoo Auto] Successfully scraped financial data from %s", link)
+                    yahoo_scraped = True
                     break  # Only process the first valid Yahoo Finance URL found
                         
                 except Exception as search_error:
-                    print(f"[Yahoo Auto] Search error: {search_error}")
+                    log.warning("[Yahoo Auto] Search error: %s", search_error)
         
         # Fallback: Try to construct Yahoo Finance URL using company ticker
-        if not any(result.get("source", "").startswith("Yahoo Finance") for result in all_results):
-            print(f"[Yahoo Auto] Attempting ticker-based URL construction for {client}")
+        if not yahoo_scraped:
+            log.info("[Yahoo Auto] Attempting ticker-based URL construction for %s", client)
             
             # Use AI to guess the stock ticker
             try:
-                client_ai = OpenAI(api_key=OPENAI_API_KEY)
-                ticker_prompt = f"""What is the stock ticker symbol for "{client}"? 
-                
-Return ONLY the ticker symbol (like AAPL, MSFT, TSLA) or "UNKNOWN" if not a public company.
-Do not include any explanation."""
-                
-                ticker_response = client_ai.chat.completions.create(
-                    model=OPENAI_MODEL,
-                    messages=[{"role": "user", "content": ticker_prompt}],
-                    max_tokens=20,
-                    temperature=0.1
-                )
-                
-                ticker = ticker_response.choices[0].message.content.strip()
+                ticker = _lookup_ticker(client)
                 
                 if ticker and ticker != "UNKNOWN" and len(ticker) <= 10:
                     constructed_url = f"https://finance.yahoo.com/quote/{ticker}"
-                    print(f"[Yahoo Auto] Trying constructed URL: {constructed_url}")
+                    log.info("[Yahoo Auto] Trying constructed URL: %s", constructed_url)
                     
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                    }
-                    response = requests.get(constructed_url, headers=headers, timeout=15)
+                    html = _fetch_page(constructed_url, 15)
                     
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        
+                    if html is not None:
                         # Extract financial data
-                        financial_sections = []
-                        for span in soup.find_all('span', limit=100):
-                            if span.text and any(term in span.text.lower() for term in ['revenue', 'market cap', 'pe ratio', 'earnings']):
-                                financial_sections.append(span.text.strip())
+                        financial_sections, page_text = _extract_financial_text(html, _TICKER_FINANCIAL_TERMS_RE, include_tables=False)
                         
                         financial_content = "\n\n".join(financial_sections[:10])
                         
-                        all_results.append({
+                        results.append({
                             "source": "Yahoo Finance (Ticker-based)",
                             "query": "ticker_financial_data", 
                             "title": f"{client} Ticker-based Financial Data ({ticker})",
-                            "snippet": financial_content or soup.get_text()[:2500],
+                            "snippet": financial_content or page_text[:2500],
                             "url": constructed_url,
                             "category": "financial"
                         })
                         
-                        print(f"[Yahoo Auto] Successfully scraped ticker-based data for {ticker}")
+                        log.info("[Yahoo Auto] Successfully scraped ticker-based data for %s", ticker)
                         
             except Exception as ticker_error:
-                print(f"[Yahoo Auto] Ticker detection error: {ticker_error}")
+                log.warning("[Yahoo Auto] Ticker detection error: %s", ticker_error)
                 
     except Exception as e:
-        print(f"[Yahoo Auto] Auto-detection error: {e}")
-    
-    # Enhanced company website scraping
+        log.warning("[Yahoo Auto] Auto-detection error: %s", e)
+    return results
+
+def _scrape_company_website(client: str, company_website: Optional[str]) -> List[Dict[str, str]]:
+    """Scrape the homepage and common about/investor/news pages of the client's website."""
+    results = []
     if company_website:
         try:
-            print(f"[Website] Scraping company information from {company_website}")
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
+            log.info("[Website] Scraping company information from %s", company_website)
             
             # Try multiple pages
             pages_to_scrape = [
@@ -1000,11 +1570,16 @@ Do not include any explanation."""
                 f"{company_website.rstrip('/')}/news"
             ]
             
-            for page_url in pages_to_scrape:
+            # Pages are independent, so fetch them all at once and process in order
+            pages = asyncio.run(_run_blocking_all(_fetch_page, [(url, 10) for url in pages_to_scrape]))
+            collected_chars = 0
+            for page_url, html in zip(pages_to_scrape, pages):
+                # Snippets are capped at 2000 chars, so three full pages is plenty; skip parsing the rest
+                if collected_chars >= 6000:
+                    break
                 try:
-                    response = requests.get(page_url, headers=headers, timeout=10)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
+                    if isinstance(html, bytes):
+                        soup = BeautifulSoup(html, HTML_PARSER)
                         
                         # Remove script and style elements
                         for script in soup(["script", "style"]):
@@ -1015,7 +1590,7 @@ Do not include any explanation."""
                         
                         # Filter for relevant content
                         if content and len(content) > 200:
-                            all_results.append({
+                            results.append({
                                 "source": "Company Website",
                                 "query": "company_info",
                                 "title": f"{client} Company Information - {page_url.split('/')[-1] or 'Homepage'}",
@@ -1023,14 +1598,65 @@ Do not include any explanation."""
                                 "url": page_url,
                                 "category": "company_website"
                             })
+                            collected_chars += min(len(content), 2000)
                 except Exception as page_error:
                     continue
             
         except Exception as e:
-            print(f"[Website] Enhanced scraping error: {e}")
+            log.warning("[Website] Enhanced scraping error: %s", e)
+    return results
+
+def comprehensive_web_search(client: str, industry: Optional[str] = None, focus: Optional[str] = None, 
+                            company_website: Optional[str] = None) -> str:
+    """Enhanced comprehensive intelligence gathering with maximum data extraction."""
+    log.info("[Web Search] Starting comprehensive intelligence gathering for %s...", client)
+    
+    all_results = []
+    seen_urls = set()
+    
+    def add_results(results: List[Dict[str, str]], scraped: bool = False) -> int:
+        """Append results whose canonical URL is new; returns how many were added.
+
+        Scraped pages are always kept (their content is richer than a search snippet
+        for the same URL) but still mark the URL as seen.
+        """
+        added = 0
+        for r in results:
+            key = _canonical_url(r.get("url", ""))
+            if scraped or (key and key not in seen_urls):
+                seen_urls.add(key)
+                all_results.append(r)
+                added += 1
+        return added
+    
+    async def search_web() -> List[Dict[str, str]]:
+        # Generate AI-powered search queries
+        search_queries = await asyncio.to_thread(generate_search_queries_with_ai, client, industry, focus)
+        log.info("[Web Search] Generated %d comprehensive search queries", len(search_queries))
+        
+        # Multi-engine web search with intelligent fallbacks
+        log.info("[Web Search] Using search engine preference: %s", SEARCH_ENGINE_PREFERENCE)
+        
+        # Process search queries concurrently instead of one after another
+        max_queries = min(10, len(search_queries))  # Process up to 10 queries
+        return await _search_queries_concurrently(search_queries[:max_queries])
+    
+    async def gather_primary_sources():
+        # Web search, Yahoo Finance and the company website hit disjoint targets, so run them together
+        return await asyncio.gather(
+            search_web(),
+            asyncio.to_thread(_scrape_yahoo_finance, client),
+            asyncio.to_thread(_scrape_company_website, client, company_website),
+        )
+    
+    search_results, yahoo_results, website_results = asyncio.run(gather_primary_sources())
+    add_results(search_results)
+    add_results(yahoo_results, scraped=True)
+    add_results(website_results, scraped=True)
+    
     
     # Enhanced alternative intelligence sources when search engines fail
-    print(f"[Web Search] Collected {len(all_results)} results, attempting enhanced alternative sources...")
+    log.info("[Web Search] Collected %d results, attempting enhanced alternative sources...", len(all_results))
     
     # Alternative source 1: Direct company website intelligence
     if len(all_results) < 20:  # If we don't have enough data
@@ -1042,79 +1668,90 @@ Do not include any explanation."""
                 f'{client} corporate site'
             ]
             
-            for website_query in website_queries:
-                try:
-                    website_results = duckduckgo_search(website_query, max_results=3)
-                    for result in website_results:
-                        url = result.get("url", "")
-                        if any(indicator in url.lower() for indicator in [client.lower().replace(" ", ""), ".com", ".org", ".net"]):
-                            print(f"[Alternative] Found potential company website: {url}")
-                            # Try to scrape this as company website
-                            try:
-                                headers = {
-                                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                                }
-                                response = requests.get(url, headers=headers, timeout=10)
-                                if response.status_code == 200:
-                                    from bs4 import BeautifulSoup
-                                    soup = BeautifulSoup(response.content, 'html.parser')
-                                    
-                                    # Remove unwanted elements
-                                    for tag in soup(["script", "style", "nav", "footer", "header"]):
-                                        tag.decompose()
-                                    
-                                    content = soup.get_text(separator=' ', strip=True)
-                                    if len(content) > 500:
-                                        all_results.append({
-                                            "source": "Company Website (Auto-detected)",
-                                            "query": "company_website_auto",
-                                            "title": f"{client} Company Website Content",
-                                            "snippet": content[:3000],  # Get substantial content
-                                            "url": url,
-                                            "category": "company_website"
-                                        })
-                                        print(f"[Alternative] Successfully scraped company website")
-                                        break
-                            except Exception as scrape_error:
-                                print(f"[Alternative] Website scraping failed: {scrape_error}")
-                    time.sleep(2)
-                except Exception as website_error:
-                    print(f"[Alternative] Website search failed: {website_error}")
-                    
-        except Exception as alt_error:
-            print(f"[Alternative Sources] Error: {alt_error}")
-    
-    # Alternative source 2: Industry-specific searches when main searches fail
-    if industry and len(all_results) < 15:
-        industry_queries = [
+            # Search all website queries at once, then fetch every candidate page at once
+            per_query = asyncio.run(_run_blocking_all(duckduckgo_search, [(q, 3) for q in website_queries]))
+            # A URL looks like a company site if it contains the client slug or a common TLD
+            site_indicator_re = re.compile(f"{re.escape(client.lower().replace(' ', ''))}|\\.com|\\.org|\\.net")
+            candidates_per_query = []
+            for website_results in per_query:
+                if isinstance(website_results, Exception):
+                    log.warning("[Alternative] Website search failed: %s", website_results)
+                    continue
+                candidates = []
+                for result in website_results:
+                    url = result.get("url", "")
+                    if site_indicator_re.search(url.lower()):
+                        log.info("[Alternative] Found potential company website: %s", url)
+                        candidates.append(url)
+                candidates_per_query.append(candidates)
+            
+            candidate_urls = list(dict.fromkeys(url for candidates in candidates_per_query for url in candidates))
+            fetched = dict(zip(candidate_urls, asyncio.run(
+                _run_blocking_all(_fetch_page, [(url, 10) for url in candidate_urls]))))
+            
+            scraped_urls = set()
+            for candidates in candidates_per_query:
+                # Keep the first usable page per query, as the sequential version did
+                for url in candidates:
+                    html = fetched.get(url)
+                    if url in scraped_urls or not isinstance(html, bytes):
+                        continue
+                    try:
+                        soup = BeautifulSoup(html, HTML_PARSER)
+                        
+                        # Remove unwanted elements
+                        for tag in soup(["script", "style", "nav", "footer", "header"]):
+                            tag.decompose()
+                        
+                        content = soup.get_text(separator=' ', strip=True)
+                        if len(content) > 500:
+                            add_results([{
+                                "source": "Company Website (Auto-detected)",
+                                "query": "company_website_auto",
+                                "title": f"{client} Company Website Content",
+                                "snippet": content[:3000],  # Get substantial content
+                                "url": url,
+                                "category": "company_website"
+                            }], scraped=True)
+                            scraped_urls.add(url)
+                            log.info("[Alternative] Successfully scraped company website")
+                            break
+                    except Exception as scrape_error:
+                        log.warning("[Alternative] Website scraping failed: %s", scrape_error)
+                    
+        except Exception as alt_error:
+            log.warning("[Alternative Sources] Error: %s", alt_error)
+    
+    # Alternative source 2: Industry-specific searches when main searches fail
+    if industry and len(all_results) < 15:
+        industry_queries = [
             f'{client} {industry} company profile',
             f'{client} {industry} market leader',
             f'{client} {industry} business overview'
         ]
         
-        for ind_query in industry_queries:
-            try:
-                ind_results = duckduckgo_search(ind_query, max_results=3)
-                all_results.extend(ind_results)
-                time.sleep(2)
-            except Exception as ind_error:
-                print(f"[Industry Search] Failed: {ind_error}")
+        per_query = asyncio.run(_run_blocking_all(duckduckgo_search, [(q, 3) for q in industry_queries]))
+        for ind_results in per_query:
+            if isinstance(ind_results, Exception):
+                log.warning("[Industry Search] Failed: %s", ind_results)
+                continue
+            add_results(ind_results)
                 
     # Skip SERP API specialized searches to avoid rate limits - focus on free sources
     
     # Validate search result quality
     quality_metrics = validate_search_quality(all_results, client)
-    print(f"[Search Quality] Score: {quality_metrics['quality_score']:.1%} | "
-          f"Results: {quality_metrics['total_results']} | "
-          f"Categories: {quality_metrics['categories_covered']} | "
-          f"Unique URLs: {quality_metrics['unique_urls']}")
+    log.info("[Search Quality] Score: %.1f%% | Results: %d | Categories: %d | Unique URLs: %d",
+             quality_metrics['quality_score'] * 100, quality_metrics['total_results'],
+             quality_metrics['categories_covered'], quality_metrics['unique_urls'])
     
     for recommendation in quality_metrics['recommendations']:
-        print(f"[Search Quality] TIP {recommendation}")
+        log.info("[Search Quality] TIP %s", recommendation)
     
     # If quality is too low, try additional targeted searches
+    enhancement_added = 0
     if quality_metrics['quality_score'] < 0.5 and len(all_results) < 15:
-        print(f"[Search Enhancement] Quality below threshold, attempting targeted searches...")
+        log.info("[Search Enhancement] Quality below threshold, attempting targeted searches...")
         
         targeted_queries = [
             f'"{client}" company overview business profile',
@@ -1124,52 +1761,47 @@ Do not include any explanation."""
             f'site:crunchbase.com "{client}"'
         ]
         
-        for targeted_query in targeted_queries:
-            try:
-                additional_results = intelligent_cascade_search(targeted_query, target_results=3)
-                # Filter duplicates
-                existing_urls = {r.get("url", "") for r in all_results}
-                new_results = [r for r in additional_results if r.get("url", "") not in existing_urls]
-                all_results.extend(new_results)
-                print(f"[Search Enhancement] Added {len(new_results)} results from targeted search")
-                time.sleep(2)
-            except Exception as e:
-                print(f"[Search Enhancement] Targeted search failed: {e}")
+        for additional_results in asyncio.run(_cascade_queries_concurrently(targeted_queries, target_results=3)):
+            if isinstance(additional_results, Exception):
+                log.warning("[Search Enhancement] Targeted search failed: %s", additional_results)
+                continue
+            added = add_results(additional_results)
+            enhancement_added += added
+            log.info("[Search Enhancement] Added %d results from targeted search", added)
     
     # Format results with enhanced structure
-    formatted_sections = []
-    
     # Group results by category
-    categories = {}
+    categories = defaultdict(list)
     for result in all_results:
-        cat = result.get("category", "general")
-        if cat not in categories:
-            categories[cat] = []
-        categories[cat].append(result)
+        categories[result.get("category", "general")].append(result)
     
-    # Format each category with richer content
+    # Format each category with richer content. Everything goes into one flat list joined
+    # once; the category header is prefixed to its first entry.
+    parts = []
     for category, results in categories.items():
-        category_content = []
-        for r in results[:10]:  # More results per category for comprehensive data
-            formatted_result = f"""Title: {r['title']}
-Content: {r['snippet']}
-Source: {r.get('source', 'Unknown')}
-URL: {r['url']}
-Query Context: {r.get('query', 'N/A')}"""
-            category_content.append(formatted_result)
-        
-        if category_content:
-            formatted_sections.append(f"\n=== {category.upper().replace('_', ' ')} INTELLIGENCE ===\n" + "\n\n".join(category_content))
+        entries = [
+            _SEARCH_RESULT_TEMPLATE.format_map({
+                "title": r['title'],
+                "snippet": r['snippet'],
+                "source": r.get('source', 'Unknown'),
+                "url": r['url'],
+                "query": r.get('query', 'N/A'),
+            })
+            for r in results[:10]  # More results per category for comprehensive data
+        ]
+        if entries:
+            entries[0] = f"\n=== {category.upper().replace('_', ' ')} INTELLIGENCE ===\n" + entries[0]
+            parts.extend(entries)
     
-    final_formatted = "\n\n".join(formatted_sections)
+    final_formatted = "\n\n".join(parts)
     
-    # Enhanced completion summary
-    final_quality = validate_search_quality(all_results, client)
-    print(f"[Web Search] SUCCESS Intelligence gathering complete:")
-    print(f"  Quality Score: {final_quality['quality_score']:.1%}")  
-    print(f"  Total Results: {final_quality['total_results']}")
-    print(f"  Categories: {final_quality['categories_covered']} ({', '.join(final_quality['categories'])})")
-    print(f"  Unique URLs: {final_quality['unique_urls']}")
+    # Enhanced completion summary (results only change after the first validation if enhancement added some)
+    final_quality = validate_search_quality(all_results, client) if enhancement_added else quality_metrics
+    log.info("[Web Search] SUCCESS Intelligence gathering complete: quality %.1f%% | %d results | "
+             "%d categories (%s) | %d unique URLs",
+             final_quality['quality_score'] * 100, final_quality['total_results'],
+             final_quality['categories_covered'], ', '.join(final_quality['categories']),
+             final_quality['unique_urls'])
     
     return final_formatted or "No comprehensive intelligence gathered."
 
@@ -1218,6 +1850,114 @@ def _normalize_legacy_intel(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def _completion_cache_key(request: Dict[str, Any]) -> str:
+    """Stable hash of a chat.completions request."""
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def _get_cached_completion(key: str) -> Optional[str]:
+    """Return the cached message content for `key` if present and not expired."""
+    with _llm_response_cache_lock:
+        entry = _llm_response_cache.get(key)
+        if entry and time.time() - entry[0] < LLM_RESPONSE_CACHE_TTL:
+            return entry[1]
+    return None
+
+def _store_completion(key: str, content: str) -> None:
+    """Cache message content for `key`; callers store only responses they managed to parse."""
+    with _llm_response_cache_lock:
+        _llm_response_cache.pop(key, None)
+        _llm_response_cache[key] = (time.time(), content)
+        while len(_llm_response_cache) > LLM_RESPONSE_CACHE_MAX:
+            _llm_response_cache.pop(next(iter(_llm_response_cache)))
+
+def _cached_chat_content(ai_client: OpenAI, request: Dict[str, Any]) -> tuple[str, str]:
+    """Run chat.completions.create(**request) unless an identical request is cached.
+
+    Returns (cache_key, stripped message content); pass the key to _store_completion once
+    the content has been validated.
+    """
+    key = _completion_cache_key(request)
+    content = _get_cached_completion(key)
+    if content is None:
+        response = ai_client.chat.completions.create(**request)
+        content = response.choices[0].message.content.strip()
+        details = getattr(getattr(response, "usage", None), "prompt_tokens_details", None)
+        if details is not None and getattr(details, "cached_tokens", None) is not None:
+            log.info("[LLM Cache] Prompt tokens served from OpenAI prompt cache: %s", details.cached_tokens)
+    else:
+        log.info("[LLM Cache] Reusing cached %s response", request.get('model'))
+    return key, content
+
+def _schema_object(**properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Strict-mode JSON schema object: every property required, nothing extra allowed."""
+    return {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+
+def _schema_field(description: str, nullable: bool = False, kind: str = "string") -> Dict[str, Any]:
+    """Scalar schema field; `nullable` allows an explicit null when the data has no value."""
+    return {"type": [kind, "null"] if nullable else kind, "description": description}
+
+def _schema_array(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema for a list of `item`."""
+    return {"type": "array", "items": item}
+
+# Structured-output schema for ai_extract_intelligence. The API enforces it, so the reply is
+# always parseable JSON in exactly this shape (nullable fields come back as null, not missing).
+INTELLIGENCE_RESPONSE_FORMAT = {
+    "name": "client_intelligence",
+    "strict": True,
+    "schema": _schema_object(
+        financial_data=_schema_object(
+            revenue=_schema_field("exact figure with currency", nullable=True),
+            market_cap=_schema_field("exact figure with currency", nullable=True),
+            growth_rate=_schema_field("percentage with timeframe", nullable=True),
+            stock_price=_schema_field("current price with currency", nullable=True),
+            pe_ratio=_schema_field("ratio value", nullable=True),
+            dividend_yield=_schema_field("percentage", nullable=True),
+            other_metrics=_schema_array(_schema_object(
+                metric=_schema_field("name"), value=_schema_field("exact value"), source_url=_schema_field("url"))),
+            source_url=_schema_field("primary financial source url", nullable=True),
+            confidence=_schema_field("0-1", kind="number"),
+        ),
+        technologies=_schema_object(
+            confirmed=_schema_array(_schema_object(
+                name=_schema_field("technology name"), source_url=_schema_field("url"),
+                category=_schema_field("cloud/software/hardware/ai/etc"))),
+            inferred=_schema_array(_schema_object(
+                name=_schema_field("technology name"), reason=_schema_field("why inferred"), category=_schema_field("type"))),
+        ),
+        vendors_partners=_schema_object(
+            confirmed=_schema_array(_schema_object(
+                name=_schema_field("company name"), source_url=_schema_field("url"),
+                relationship_type=_schema_field("vendor/partner/supplier/customer"))),
+            inferred=_schema_array(_schema_object(
+                name=_schema_field("company name"), reason=_schema_field("why inferred"), relationship_type=_schema_field("type"))),
+        ),
+        recent_projects=_schema_array(_schema_object(
+            title=_schema_field("project name"), description=_schema_field("brief description"),
+            source_url=_schema_field("url"), timeline=_schema_field("timeframe"))),
+        announcements=_schema_array(_schema_object(
+            title=_schema_field("announcement"), summary=_schema_field("1-2 sentences"), source_url=_schema_field("url"),
+            date=_schema_field("date mentioned"), impact=_schema_field("business impact"))),
+        strategic_focus=_schema_array(_schema_object(
+            theme=_schema_field("focus area"), evidence=_schema_field("supporting evidence"),
+            source_url=_schema_field("url", nullable=True), priority=_schema_field("high/medium/low"))),
+        competitive_landscape=_schema_array(_schema_object(
+            competitor=_schema_field("company name"), relationship=_schema_field("competing/collaborating/acquiring"),
+            source_url=_schema_field("url"))),
+        tech_roadmap=_schema_array(_schema_object(
+            initiative=_schema_field("technology initiative"), timeline=_schema_field("expected timeframe"),
+            description=_schema_field("brief description"), source_url=_schema_field("url"))),
+        leadership_team=_schema_array(_schema_object(
+            name=_schema_field("person name"), position=_schema_field("job title"),
+            background=_schema_field("brief background"), source_url=_schema_field("url"))),
+        it_infrastructure_summary=_schema_field("comprehensive summary of IT infrastructure and technology stack", nullable=True),
+        business_context=_schema_field("overall business situation and market context", nullable=True),
+        market_position=_schema_field("company's competitive position and market standing", nullable=True),
+        confidence_score=_schema_field("0-1, based on data completeness and source reliability", kind="number"),
+    ),
+}
+
 def ai_extract_intelligence(web_data: str) -> Dict[str, Any]:
     """Extract comprehensive structured intelligence from aggregated web data with enhanced schema.
 
@@ -1250,55 +1990,25 @@ def ai_extract_intelligence(web_data: str) -> Dict[str, Any]:
     )
 
     instruction = f"""COMPREHENSIVE SOURCE DATA:\n\n{web_data}\n\n
-Extract ALL available information into this enhanced JSON schema (no markdown formatting):\n{{
-  "financial_data": {{
-      "revenue": "exact figure with currency or null",
-      "market_cap": "exact figure with currency or null", 
-      "growth_rate": "percentage with timeframe or null",
-      "stock_price": "current price with currency or null",
-      "pe_ratio": "ratio value or null",
-      "dividend_yield": "percentage or null",
-      "other_metrics": [{{"metric": "name", "value": "exact value", "source_url": "url"}}],
-      "source_url": "primary financial source url",
-      "confidence": 0.0
-  }},
-  "technologies": {{
-      "confirmed": [{{"name": "technology name", "source_url": "url", "category": "cloud/software/hardware/ai/etc"}}],
-      "inferred": [{{"name": "technology name", "reason": "why inferred", "category": "type"}}]
-  }},
-  "vendors_partners": {{
-      "confirmed": [{{"name": "company name", "source_url": "url", "relationship_type": "vendor/partner/supplier/customer"}}],
-      "inferred": [{{"name": "company name", "reason": "why inferred", "relationship_type": "type"}}]
-  }},
-  "recent_projects": [{{"title": "project name", "description": "brief description", "source_url": "url", "timeline": "timeframe"}}],
-  "announcements": [{{"title": "announcement", "summary": "1-2 sentences", "source_url": "url", "date": "date mentioned", "impact": "business impact"}}],
-  "strategic_focus": [{{"theme": "focus area", "evidence": "supporting evidence", "source_url": "url", "priority": "high/medium/low"}}],
-  "competitive_landscape": [{{"competitor": "company name", "relationship": "competing/collaborating/acquiring", "source_url": "url"}}],
-  "tech_roadmap": [{{"initiative": "technology initiative", "timeline": "expected timeframe", "description": "brief description", "source_url": "url"}}],
-  "leadership_team": [{{"name": "person name", "position": "job title", "background": "brief background", "source_url": "url"}}],
-  "it_infrastructure_summary": "comprehensive summary of IT infrastructure and technology stack or null",
-  "business_context": "overall business situation and market context or null", 
-  "market_position": "company's competitive position and market standing or null",
-  "confidence_score": 0.0
-}}\n\nEXTRACTION RULES:\n- Extract ALL factual information present, no matter how detailed\n- INFER reasonable information when direct data is limited (mark as "inferred")\n- Use exact figures, currencies, percentages, dates when available\n- Categorize technologies (cloud, AI, software, hardware, etc.)\n- Specify relationship types for vendors/partners\n- Include timeline information when mentioned\n- Assess business impact of announcements\n- Prioritize strategic focus areas when context allows\n- For limited data: make educated inferences based on industry and company context\n- Confidence score (0-1) based on data completeness and source reliability\n- Maximum 15 items per array section for comprehensive coverage\n- IMPORTANT: When data is sparse, populate "inferred" sections with reasonable assumptions"""
+Extract ALL available information into the provided JSON schema.\n\nEXTRACTION RULES:\n- Extract ALL factual information present, no matter how detailed\n- INFER reasonable information when direct data is limited (mark as "inferred")\n- Use exact figures, currencies, percentages, dates when available\n- Categorize technologies (cloud, AI, software, hardware, etc.)\n- Specify relationship types for vendors/partners\n- Include timeline information when mentioned\n- Assess business impact of announcements\n- Prioritize strategic focus areas when context allows\n- For limited data: make educated inferences based on industry and company context\n- Confidence score (0-1) based on data completeness and source reliability\n- Maximum 15 items per array section for comprehensive coverage\n- IMPORTANT: When data is sparse, populate "inferred" sections with reasonable assumptions"""
 
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
+        client = _openai_client()
+        cache_key, raw = _cached_chat_content(client, dict(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": base_system},
                 {"role": "user", "content": instruction}
             ],
             temperature=0,
-            response_format={"type": "json_object"}
-        )
-        raw = response.choices[0].message.content.strip()
+            response_format={"type": "json_schema", "json_schema": INTELLIGENCE_RESPONSE_FORMAT}
+        ))
         try:
-            data = json.loads(raw)
+            data = _loads_json(raw)
         except json.JSONDecodeError as je:
-            print(f"[AI Intelligence] JSON parse error, returning legacy normalization attempt: {je}")
+            log.warning("[AI Intelligence] JSON parse error, returning legacy normalization attempt: %s", je)
             return {"error": "parse_error", "raw": raw[:500]}
+        _store_completion(cache_key, raw)
 
         # Enhanced defensive defaults for comprehensive schema
         def ensure(key, default):
@@ -1339,91 +2049,30 @@ Extract ALL available information into this enhanced JSON schema (no markdown fo
                 data[arr_key] = data[arr_key][:limit]
 
         # Enhanced diagnostics
-        tech_confirmed = len(data.get('technologies', {}).get('confirmed', []))
-        tech_inferred = len(data.get('technologies', {}).get('inferred', []))
-        vendors_confirmed = len(data.get('vendors_partners', {}).get('confirmed', []))
-        vendors_inferred = len(data.get('vendors_partners', {}).get('inferred', []))
-        
-        print("[AI Intelligence] Comprehensive extraction results: " + ", ".join([
-            f"tech_confirmed={tech_confirmed}",
-            f"tech_inferred={tech_inferred}", 
-            f"vendors_confirmed={vendors_confirmed}",
-            f"vendors_inferred={vendors_inferred}",
-            f"announcements={len(data.get('announcements', []))}",
-            f"projects={len(data.get('recent_projects', []))}",
-            f"strategic_focus={len(data.get('strategic_focus', []))}",
-            f"tech_roadmap={len(data.get('tech_roadmap', []))}",
-            f"leadership={len(data.get('leadership_team', []))}",
-            f"confidence={data.get('confidence_score', 0):.2f}"
-        ]))
+        if log.isEnabledFor(logging.INFO):
+            log.info(
+                "[AI Intelligence] Comprehensive extraction results: tech_confirmed=%d, tech_inferred=%d, "
+                "vendors_confirmed=%d, vendors_inferred=%d, announcements=%d, projects=%d, "
+                "strategic_focus=%d, tech_roadmap=%d, leadership=%d, confidence=%.2f",
+                len(data.get('technologies', {}).get('confirmed', [])),
+                len(data.get('technologies', {}).get('inferred', [])),
+                len(data.get('vendors_partners', {}).get('confirmed', [])),
+                len(data.get('vendors_partners', {}).get('inferred', [])),
+                len(data.get('announcements', [])),
+                len(data.get('recent_projects', [])),
+                len(data.get('strategic_focus', [])),
+                len(data.get('tech_roadmap', [])),
+                len(data.get('leadership_team', [])),
+                data.get('confidence_score', 0),
+            )
 
         return data
     except Exception as e:
-        print(f"[AI Intelligence] Error: {e}")
+        log.error("[AI Intelligence] Error: %s", e)
         return {"error": str(e)}
 
-def openai_benefits_summary(client: str, rows: List[Dict[str, str]], intelligence_data: Optional[Dict] = None) -> Dict[str, str]:
-    """
-    PROFESSIONAL PRESALES-GRADE PROMPT TEMPLATE
-    Generate SHORT and LONG pitches from a presales manager's perspective.
-    """
-    if not OPENAI_API_KEY:
-        return {
-            "short": f"OpenAI API key not configured. Cannot generate pitch for {client}.",
-            "long": "Please configure OPENAI_API_KEY environment variable."
-        }
-
-    ai_client = OpenAI(api_key=OPENAI_API_KEY)
-
-    # Build context from matched rows
-    evidence_lines = []
-    for i, r in enumerate(rows, 1):
-        evidence_lines.append(f"""
-Project {i}:
-- Client: {_safe_str(r.get('client_name', r.get('client', '')))}
-- Industry: {_safe_str(r.get('industry', ''))}
-- Technologies: {_safe_str(r.get('technologies', r.get('technology', '')))}
-- Business Challenge: {_safe_str(r.get('business_case', ''))}
-- Evoke Solution: {_safe_str(r.get('evoke_solution_/_value_add_to_the_customer_(what_/_how)', r.get('value_add', '')))}
-- Key Deliverables: {_safe_str(r.get('key_deliverables', ''))}
-- Project Status: {_safe_str(r.get('status', ''))}
-""")
-
-    evidence_block = "\n".join(evidence_lines) if evidence_lines else "(No matching projects found)"
-
-    # Build intelligence context
-    intelligence_context = ""
-    if intelligence_data and not intelligence_data.get("error"):
-        intel_parts = []
-        
-        if "financial_data" in intelligence_data:
-            # financial = [f"- {item.get('metric', '')}: {item.get('value', '')}" 
-            #             for item in intelligence_data["financial_data"]]
-            financial = []
-            for item in intelligence_data["financial_data"]:
-                if isinstance(item, dict):          # new schema
-                    financial.append(f"- {item.get('metric', '')}: {item.get('value', '')}")
-                elif isinstance(item, str):         # legacy flat list
-                    financial.append(f"- {item}")
-            if financial:
-                intel_parts.append("Financial Intelligence:\n" + "\n".join(financial))
-        
-        if "technologies" in intelligence_data:
-            techs = [f"- {item.get('name', '') if isinstance(item, dict) else item}" 
-                    for item in intelligence_data["technologies"]]
-            if techs:
-                intel_parts.append("Technology Stack:\n" + "\n".join(techs))
-        
-        if "recent_announcements" in intelligence_data:
-            announcements = [f"- {item.get('title', '')}: {item.get('summary', '')}" 
-                           for item in intelligence_data["recent_announcements"]]
-            if announcements:
-                intel_parts.append("Recent Announcements:\n" + "\n".join(announcements))
-        
-        intelligence_context = "\n\n".join(intel_parts) if intel_parts else ""
-
-    # ENHANCED PRESALES-GRADE SYSTEM PROMPT WITH WORD COUNT CONSTRAINTS
-    system_prompt = """You are a presales consultant for Evoke Technologies. Generate TWO summaries with STRICT word count requirements:
+# ENHANCED PRESALES-GRADE SYSTEM PROMPT WITH WORD COUNT CONSTRAINTS
+PITCH_SYSTEM_PROMPT = """You are a presales consultant for Evoke Technologies. Generate TWO summaries with STRICT word count requirements:
 
 1. SHORT SUMMARY (EXACTLY 250-300 words):
    - Hook: Why this matters NOW (reference recent news/announcements if available)
@@ -1461,15 +2110,8 @@ CRITICAL REQUIREMENTS:
 - COUNT YOUR WORDS - SHORT must be 250-300 words, LONG must be 800-1000 words
 - Use markdown formatting (## for sections, **bold** for emphasis)"""
 
-    user_prompt = f"""CLIENT: {client}
-
-EVOKE PORTFOLIO PROJECTS:
-{evidence_block}
-
-CLIENT INTELLIGENCE DATA:
-{intelligence_context if intelligence_context else "(Limited intelligence available - focus on industry trends)"}
-
-TASK:
+# Fixed pitch task/format instructions; the per-client data is appended after them
+PITCH_TASK_INSTRUCTIONS = """TASK:
 Generate THREE outputs with STRICT requirements:
 
 1. SHORT SUMMARY (250-300 words total):
@@ -1485,42 +2127,9 @@ Generate THREE outputs with STRICT requirements:
    - Rich narratives with specific examples and metrics
    - MUST BE 800-1000 WORDS
 
-3. STRUCTURED JSON FOR INTERACTIVE DISPLAY:
-   Return a "long_structured" object with this format:
-   {{
-     "sections": [
-       {{
-         "title": "Business Context",
-         "bullet_points": [
-           {{
-             "summary": "Market Position & Financial Health",
-             "details": ["Strong market position in engineering services sector", "Revenue growth of X% in recent quarters", "Key strategic positioning advantages in their industry"]
-           }},
-           {{
-             "summary": "Recent Strategic Initiatives", 
-             "details": ["Digital transformation initiatives launched", "Strategic partnerships with technology vendors", "Investment in automation and AI capabilities"]
-           }}
-         ]
-       }},
-       {{
-         "title": "Evoke's Relevant Experience",
-         "bullet_points": [
-           {{
-             "summary": "Similar Client Success Stories",
-             "details": "Specific examples of how we've helped companies like X achieve Y outcomes with Z technologies, resulting in measurable benefits..."
-           }}
-         ]
-       }}
-     ]
-   }}
-
-CRITICAL OUTPUT FORMAT:
-Return a JSON object with exactly these three keys:
-{{
-  "short": "250-300 word summary...",
-  "long": "800-1000 word detailed pitch covering all four sections...",
-  "long_structured": {{ "sections": [array of sections] }}
-}}
+3. STRUCTURED SECTIONS FOR INTERACTIVE DISPLAY ("long_structured"):
+   - The same four sections as the long summary, each with a title
+   - 2-4 bullet points per section: a short theme summary plus 2-4 specific details
 
 CONTENT REQUIREMENTS:
 - Use intelligence data to create compelling, timely narratives
@@ -1529,62 +2138,199 @@ CONTENT REQUIREMENTS:
 - Be specific with numbers and metrics
 - Ensure ALL sections are included: Business Context, Evoke's Relevant Experience, Strategic Fit & Value Proposition, Next Steps & Engagement Model
 - Each section should have 2-4 meaningful bullet points with substantive details
-- IMPORTANT: "details" field must be an ARRAY of 2-4 specific points, not a single string
 - COUNT YOUR WORDS CAREFULLY"""
 
-    try:
-        print(f"[API] Calling OpenAI API with model: {OPENAI_MODEL}")
-        resp = ai_client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=3000,
-            response_format={"type": "json_object"}
-        )
+# Structured-output schema for the pitch; the response shape is enforced by the API
+PITCH_RESPONSE_FORMAT = {
+    "name": "presales_pitch",
+    "strict": True,
+    "schema": _schema_object(
+        short=_schema_field("250-300 word summary"),
+        long=_schema_field("800-1000 word detailed pitch covering all four sections"),
+        long_structured=_schema_object(sections=_schema_array(_schema_object(
+            title=_schema_field("section title"),
+            bullet_points=_schema_array(_schema_object(
+                summary=_schema_field("bullet theme"),
+                details=_schema_array(_schema_field("specific point; 2-4 per bullet")),
+            )),
+        ))),
+    ),
+}
+
+# One portfolio project in the pitch prompt's evidence block
+_EVIDENCE_TEMPLATE = (
+    "\nProject {i}:\n- Client: {client}\n- Industry: {industry}\n- Technologies: {technologies}\n"
+    "- Business Challenge: {business_case}\n- Evoke Solution: {solution}\n"
+    "- Key Deliverables: {deliverables}\n- Project Status: {status}\n"
+)
+
+def _build_pitch_request(client: str, rows: List[Dict[str, str]], intelligence_data: Optional[Dict] = None) -> Dict[str, Any]:
+    """Chat completion kwargs for the pitch prompt (shared by the blocking and streaming endpoints)."""
+    # Build context from matched rows
+    evidence_block = "\n".join(
+        _EVIDENCE_TEMPLATE.format_map({
+            "i": i,
+            "client": _safe_str(r.get('client_name') or r.get('client')),
+            "industry": _safe_str(r.get('industry')),
+            "technologies": _safe_str(r.get('technologies') or r.get('technology')),
+            "business_case": _safe_str(r.get('business_case')),
+            "solution": _safe_str(r.get(VALUE_ADD_COLUMN) or r.get('value_add')),
+            "deliverables": _safe_str(r.get('key_deliverables')),
+            "status": _safe_str(r.get('status')),
+        })
+        for i, r in enumerate(rows, 1)
+    ) or "(No matching projects found)"
+
+    # Build intelligence context
+    intelligence_context = ""
+    if intelligence_data and not intelligence_data.get("error"):
+        intel_parts = []
         
-        print(f"[API] OpenAI response received, parsing JSON...")
-        raw_content = resp.choices[0].message.content.strip()
-        print(f"[API] Raw response length: {len(raw_content)} characters")
+        if "financial_data" in intelligence_data:
+            # financial = [f"- {item.get('metric', '')}: {item.get('value', '')}" 
+            #             for item in intelligence_data["financial_data"]]
+            financial = []
+            for item in intelligence_data["financial_data"]:
+                if isinstance(item, dict):          # new schema
+                    financial.append(f"- {item.get('metric', '')}: {item.get('value', '')}")
+                elif isinstance(item, str):         # legacy flat list
+                    financial.append(f"- {item}")
+            if financial:
+                intel_parts.append("Financial Intelligence:\n" + "\n".join(financial))
+        
+        if "technologies" in intelligence_data:
+            techs = [f"- {item.get('name', '') if isinstance(item, dict) else item}" 
+                    for item in intelligence_data["technologies"]]
+            if techs:
+                intel_parts.append("Technology Stack:\n" + "\n".join(techs))
+        
+        if "recent_announcements" in intelligence_data:
+            announcements = [f"- {item.get('title', '')}: {item.get('summary', '')}" 
+                           for item in intelligence_data["recent_announcements"]]
+            if announcements:
+                intel_parts.append("Recent Announcements:\n" + "\n".join(announcements))
+        
+        intelligence_context = "\n\n".join(intel_parts) if intel_parts else ""
+
+    # Static instructions first and per-client data last, so repeated calls share a long
+    # identical prefix that OpenAI's automatic prompt caching can reuse
+    system_prompt = PITCH_SYSTEM_PROMPT
+    user_prompt = f"""{PITCH_TASK_INSTRUCTIONS}
+
+CLIENT: {client}
+
+EVOKE PORTFOLIO PROJECTS:
+{evidence_block}
+
+CLIENT INTELLIGENCE DATA:
+{intelligence_context if intelligence_context else "(Limited intelligence available - focus on industry trends)"}"""
+
+    return dict(
+        model=OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        temperature=0.7,
+        max_tokens=3000,
+        response_format={"type": "json_schema", "json_schema": PITCH_RESPONSE_FORMAT}
+    )
+
+def openai_benefits_summary(client: str, rows: List[Dict[str, str]], intelligence_data: Optional[Dict] = None) -> Dict[str, str]:
+    """
+    PROFESSIONAL PRESALES-GRADE PROMPT TEMPLATE
+    Generate SHORT and LONG pitches from a presales manager's perspective.
+    """
+    if not OPENAI_API_KEY:
+        return {
+            "short": f"OpenAI API key not configured. Cannot generate pitch for {client}.",
+            "long": "Please configure OPENAI_API_KEY environment variable."
+        }
+
+    ai_client = _openai_client()
+
+    try:
+        log.info("[API] Calling OpenAI API with model: %s", OPENAI_MODEL)
+        cache_key, raw_content = _cached_chat_content(ai_client, _build_pitch_request(client, rows, intelligence_data))
+        log.debug("[API] OpenAI response received: %d characters", len(raw_content))
         
         result = json.loads(raw_content)
-        print(f"[API] JSON parsing successful, keys: {list(result.keys())}")
+        _store_completion(cache_key, raw_content)
+        log.debug("[API] JSON parsing successful, keys: %s", list(result.keys()))
         
         short = result.get('short', '')
         long = result.get('long', '')
         long_structured = result.get('long_structured', None)
         
-        print(f"[SUMMARY] Generated summaries:")
-        print(f"  - Short: {len(short.split())} words")
-        print(f"  - Long: {len(long.split())} words")
-        if long_structured:
-            sections_count = len(long_structured.get('sections', []))
-            print(f"  - Structured: {sections_count} sections")
-        else:
-            print(f"  - Structured: None (missing in response)")
+        if log.isEnabledFor(logging.INFO):
+            sections = f"{len(long_structured.get('sections', []))} sections" if long_structured else "None (missing in response)"
+            log.info("[SUMMARY] Generated summaries: short=%d words, long=%d words, structured=%s", len(short.split()), len(long.split()), sections)
         
         return {"short": short, "long": long, "long_structured": long_structured}
 
     except json.JSONDecodeError as e:
-        print(f"[Pitch Generation] JSON Error: {e}")
-        print(f"[Pitch Generation] Raw content: {raw_content[:500]}...")
+        log.warning("[Pitch Generation] JSON Error: %s; raw content: %.500s...", e, raw_content)
         return {
             "short": f"JSON parsing error: {str(e)}",
             "long": f"The API response was not valid JSON. Please try again.",
             "long_structured": None
         }
     except Exception as e:
-        print(f"[Pitch Generation] Error: {e}")
-        import traceback
-        print(f"[Pitch Generation] Traceback: {traceback.format_exc()}")
+        log.exception("[Pitch Generation] Error: %s", e)
         return {
             "short": f"Error generating pitch: {str(e)}",
             "long": f"Please check API configuration and try again.",
             "long_structured": None
         }
 
+def _get_cached_query_embedding(key: str) -> Optional[np.ndarray]:
+    """Return the cached unit query vector for `key` (memory first, then SQLite), or None."""
+    vectors = _query_embedding_cache["vectors"]
+    with _query_embedding_cache_lock:
+        vec = vectors.pop(key, None)
+        if vec is not None:
+            vectors[key] = vec  # move to most-recently-used
+            _query_embedding_cache["hits"] += 1
+            return vec
+
+    vec = None
+    if QUERY_EMBEDDINGS_CACHE_FILE.exists():
+        try:
+            with closing(sqlite3.connect(QUERY_EMBEDDINGS_CACHE_FILE)) as conn:
+                row = conn.execute("SELECT vec FROM query_embeddings WHERE key = ?", (key,)).fetchone()
+            if row:
+                vec = np.frombuffer(row[0], dtype=np.float32)
+        except sqlite3.Error as e:
+            log.warning("[Embeddings] Query cache read error: %s", e)
+
+    with _query_embedding_cache_lock:
+        if vec is None:
+            _query_embedding_cache["misses"] += 1
+            return None
+        _query_embedding_cache["hits"] += 1
+        _remember_query_embedding(key, vec)
+    return vec
+
+def _remember_query_embedding(key: str, vec: np.ndarray) -> None:
+    """Insert into the in-memory LRU, evicting the oldest entries (caller holds the lock)."""
+    vectors = _query_embedding_cache["vectors"]
+    vectors[key] = vec
+    while len(vectors) > QUERY_EMBEDDINGS_CACHE_MAX:
+        vectors.pop(next(iter(vectors)))
+
+def _store_query_embedding(key: str, vec: np.ndarray) -> None:
+    """Cache a unit query vector in memory and on disk."""
+    vec = np.ascontiguousarray(vec, dtype=np.float32)
+    vec.setflags(write=False)  # shared with later callers
+    with _query_embedding_cache_lock:
+        _remember_query_embedding(key, vec)
+    try:
+        with closing(sqlite3.connect(QUERY_EMBEDDINGS_CACHE_FILE)) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS query_embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)")
+            conn.execute("INSERT OR REPLACE INTO query_embeddings (key, vec) VALUES (?, ?)", (key, vec.tobytes()))
+    except sqlite3.Error as e:
+        log.warning("[Embeddings] Query cache write error: %s", e)
+
 def select_rows_for_summary(
     client: str,
     industry: Optional[str],
@@ -1596,11 +2342,9 @@ def select_rows_for_summary(
     Semantic search with enhanced reasoning for row selection.
     Returns rows with match scores, similarity, and detailed reasoning.
     """
-    print(f"\n{'='*80}")
-    print(f"[Portfolio Search] Client: {client} | Industry: {industry} | Tech: {technology}")
-    print(f"{'='*80}")
+    log.info("[Portfolio Search] Client: %s | Industry: %s | Tech: %s", client, industry, technology)
 
-    embeddings, df = load_or_create_embeddings()
+    embeddings, df = get_portfolio_snapshot()
     if df.empty or len(embeddings) == 0:
         return []
 
@@ -1615,77 +2359,134 @@ def select_rows_for_summary(
     
     query_text = " ".join(query_parts)
     
-    try:
-        ai_client = OpenAI(api_key=OPENAI_API_KEY)
-        query_response = ai_client.embeddings.create(
-            model="text-embedding-3-small",
-            input=[query_text],
-            dimensions=1536
-        )
-        query_embedding = np.array(query_response.data[0].embedding, dtype=np.float32)
-    except Exception as e:
-        print(f"[Embeddings] Query embedding error: {e}")
-        return []
-
-    # Compute similarities
-    similarities = cosine_similarity_batch(query_embedding, embeddings)
+    # Repeated (client, industry, technology, focus) lookups reuse the cached vector
+    cache_key = _embedding_text_hash(query_text)
+    query_embedding = _get_cached_query_embedding(cache_key)
+    if query_embedding is None:
+        try:
+            ai_client = _openai_client()
+            query_response = ai_client.embeddings.create(
+                model="text-embedding-3-small",
+                input=[query_text],
+                dimensions=1536
+            )
+            query_embedding = np.array(query_response.data[0].embedding, dtype=np.float32)
+            query_embedding /= (np.linalg.norm(query_embedding) or 1)
+        except Exception as e:
+            log.warning("[Embeddings] Query embedding error: %s", e)
+            return []
+        _store_query_embedding(cache_key, query_embedding)
+    log.debug("[Embeddings] Query cache: %d hits / %d misses", _query_embedding_cache['hits'], _query_embedding_cache['misses'])
 
-    # Pre-filter by industry if specified
-    candidate_indices = list(range(len(df)))
+    # Pre-filter by industry if specified (matches distinct industries, not every row)
+    candidate_indices = np.arange(len(df))
     if industry:
-        industry_lower = industry.lower()
-        candidate_indices = [
-            i for i in candidate_indices
-            if industry_lower in _safe_str(df.iloc[i].get('industry', '')).lower()
-        ]
-        print(f"[Filter] Industry pre-filter: {len(candidate_indices)} candidates")
-
-    if not candidate_indices:
-        candidate_indices = list(range(len(df)))
-
-    # Score all candidates
-    scored_rows = []
-    for idx in candidate_indices:
-        row = df.iloc[idx]
-        row_embedding = embeddings[idx]
-        
-        scoring_result = score_row_with_reasoning(
-            row=row,
-            query_embedding=query_embedding,
-            row_embedding=row_embedding,
-            client=client,
-            industry=industry,
-            technology=technology,
-            focus=focus
-        )
-
-        row_dict = row.to_dict()
-        row_dict.update(scoring_result)
-        scored_rows.append(row_dict)
-
-    # Sort by match score descending
-    scored_rows.sort(key=lambda x: x["match_score"], reverse=True)
-
-    # Return top matches
-    top_matches = scored_rows[:limit]
+        candidate_indices = industry_candidates(get_scoring_features(df), industry)
+        log.info("[Filter] Industry pre-filter: %d candidates", len(candidate_indices))
+
+    if len(candidate_indices) == 0:
+        candidate_indices = np.arange(len(df))
+
+    # Score all candidates in one vectorized pass
+    top_matches = score_rows_bulk(
+        df=df,
+        query_embedding=query_embedding,
+        embeddings=embeddings,
+        industry=industry,
+        technology=technology,
+        focus=focus,
+        candidate_indices=candidate_indices,
+        limit=limit
+    )
     
-    print(f"[Portfolio Search] Top {len(top_matches)} matches:")
-    for i, match in enumerate(top_matches, 1):
-        print(f"  {i}. {match.get('client_name', 'Unknown')} - Score: {match['match_score']}% | Similarity: {match['semantic_similarity']}%")
+    log.info("[Portfolio Search] Top %d matches", len(top_matches))
+    if log.isEnabledFor(logging.DEBUG):
+        for i, match in enumerate(top_matches, 1):
+            log.debug("  %d. %s - Score: %s%% | Similarity: %s%%", i, match.get('client_name', 'Unknown'), match['match_score'], match['semantic_similarity'])
 
     return top_matches
 
 # ===================== API ENDPOINTS =====================
 
+async def _portfolio_refresh_loop():
+    """Build the portfolio snapshot, then rebuild it whenever the Excel file changes (polled)."""
+    try:
+        await asyncio.to_thread(load_or_create_embeddings)
+    except Exception:
+        log.exception("[Portfolio Refresh] Initial load failed; will retry on the next poll")
+    while True:
+        await asyncio.sleep(PORTFOLIO_REFRESH_INTERVAL)
+        try:
+            await asyncio.to_thread(load_or_create_embeddings)
+        except Exception:
+            log.exception("[Portfolio Refresh] Refresh failed")
+
+@app.on_event("startup")
+async def warm_portfolio_cache():
+    """Load portfolio + embeddings in the background and keep them fresh."""
+    # The first build runs off the startup path so uvicorn binds its port at once (a cold
+    # cache re-embeds the whole workbook); early requests wait on _embeddings_build_lock
+    # and reuse that build instead of starting their own
+    app.state.portfolio_refresh_task = asyncio.create_task(_portfolio_refresh_loop())
+
+@app.on_event("shutdown")
+async def stop_portfolio_refresh():
+    """Stop the background portfolio refresher."""
+    task = getattr(app.state, "portfolio_refresh_task", None)
+    if task:
+        task.cancel()
+
+# Well-known companies resolved without a model call (keys as produced by _company_key)
+KNOWN_COMPANY_INDUSTRIES = {
+    "Technology": [
+        "apple", "microsoft", "google", "alphabet", "amazon", "meta", "facebook", "netflix", "ibm", "oracle",
+        "salesforce", "adobe", "intel", "nvidia", "cisco", "sap", "dell", "hp", "accenture", "infosys",
+        "tata consultancy services", "wipro", "uber", "airbnb",
+    ],
+    "Financial Services": [
+        "jpmorgan", "jpmorgan chase", "goldman sachs", "morgan stanley", "bank of america", "citigroup", "citi",
+        "wells fargo", "american express", "visa", "mastercard", "paypal", "blackrock", "hsbc", "barclays",
+    ],
+    "Healthcare": ["pfizer", "johnson & johnson", "unitedhealth", "merck", "abbott", "cvs health", "moderna"],
+    "Retail": ["walmart", "target", "costco", "home depot", "ikea", "walgreens"],
+    "Automotive": ["tesla", "ford", "general motors", "toyota", "volkswagen", "bmw", "honda"],
+    "Energy": ["exxonmobil", "chevron", "shell", "bp"],
+    "Telecommunications": ["verizon", "at&t", "t-mobile", "vodafone", "comcast"],
+    "Aerospace": ["boeing", "airbus", "lockheed martin"],
+    "Manufacturing": ["general electric", "caterpillar", "3m", "siemens", "honeywell"],
+    "Media": ["disney", "warner bros discovery", "spotify"],
+}
+_KNOWN_INDUSTRY_BY_COMPANY = {company: industry for industry, companies in KNOWN_COMPANY_INDUSTRIES.items() for company in companies}
+KNOWN_INDUSTRY_CONFIDENCE = 0.95
+
+# Legal suffixes ignored when matching company names ("Apple Inc." -> "apple")
+_COMPANY_SUFFIX_RE = re.compile(r"[\s,&]+(inc|incorporated|corp|corporation|co|company|ltd|limited|llc|plc|ag|sa|group|holdings)\.?$")
+
+def _company_key(name: str) -> str:
+    """Normalize a company name for KNOWN_COMPANY_INDUSTRIES lookups."""
+    key = " ".join(_safe_str(name).lower().replace(".com", "").split()).rstrip(".")
+    while True:
+        stripped = _COMPANY_SUFFIX_RE.sub("", key)
+        if stripped == key:
+            return key
+        key = stripped
+
+def _known_industry(name: str) -> Optional[str]:
+    """Industry for a well-known company, or None if it needs a model call."""
+    return _KNOWN_INDUSTRY_BY_COMPANY.get(_company_key(name))
+
 @app.post("/determine_industry")
 def determine_industry(req: dict):
-    """Detect industry from customer name using GPT-4o."""
+    """Detect industry from customer name (lookup table for well-known companies, GPT-4o otherwise)."""
     customer = req.get("customer", "")
+    known = _known_industry(customer)
+    if known:
+        return {"data": {"industry": known, "confidence": KNOWN_INDUSTRY_CONFIDENCE}}
     if not customer or not OPENAI_API_KEY:
         return {"data": {"industry": "", "confidence": 0.0}}
 
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = _openai_client()
         
         prompt = f"""Identify the primary industry for this company: {customer}
 
@@ -1698,36 +2499,33 @@ Examples:
 
 Be specific but concise (1-2 words for industry)."""
 
-        response = client.chat.completions.create(
+        cache_key, content = _cached_chat_content(client, dict(
             model="gpt-4o",
             messages=[{"role": "user", "content": prompt}],
             temperature=0,
             response_format={"type": "json_object"}
-        )
+        ))
 
-        result = json.loads(response.choices[0].message.content.strip())
+        result = json.loads(content)
+        _store_completion(cache_key, content)
         return {"data": result}
 
     except Exception as e:
-        print(f"[Industry Detection] Error: {e}")
+        log.error("[Industry Detection] Error: %s", e)
         return {"data": {"industry": "", "confidence": 0.0}}
 
-@app.post("/portfolio_summary", response_model=PortfolioSummaryResponse)
-def portfolio_summary(req: PortfolioRequest):
-    """Main endpoint: Search portfolio and gather intelligence."""
-    print("\n" + "="*80)
-    print(f"[API] Starting portfolio search for: {req.client}")
-    print("="*80)
-    
-    # Auto-detect industry if not provided
-    detected_industry = req.industry
+def _detect_portfolio_industry(client: str) -> tuple[str, Optional[float]]:
+    """Guess the client's industry for /portfolio_summary; returns (industry, confidence)."""
+    detected_industry = ""
     industry_confidence = None
-    
-    if not req.industry and req.client:
-        print(f"[API] Auto-detecting industry for {req.client}")
-        try:
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            prompt = f"""Identify the primary industry for this company: {req.client}
+    known = _known_industry(client)
+    if known:
+        log.info("[API] Known industry for %s: %s", client, known)
+        return known, KNOWN_INDUSTRY_CONFIDENCE
+    log.info("[API] Auto-detecting industry for %s", client)
+    try:
+        ai_client = _openai_client()
+        prompt = f"""Identify the primary industry for this company: {client}
 
 You must respond with ONLY a valid JSON object in this exact format:
 {{"industry": "Industry Name", "confidence": 0.85}}
@@ -1736,71 +2534,76 @@ Use one of these industry categories: Technology, Healthcare, Financial Services
 
 Do not include any explanation or additional text."""
 
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=100,
-                temperature=0.1
-            )
-            
-            response_text = response.choices[0].message.content.strip()
-            print(f"[API] Raw OpenAI response: {response_text}")
-            
-            # Try to extract JSON even if there's extra text
-            if '{' in response_text and '}' in response_text:
-                start = response_text.find('{')
-                end = response_text.rfind('}') + 1
-                json_text = response_text[start:end]
-                result = json.loads(json_text)
-            else:
-                # Fallback: manual parsing for common cases
-                if req.client.lower() in ['apple', 'microsoft', 'google', 'amazon']:
-                    result = {"industry": "Technology", "confidence": 0.9}
-                else:
-                    result = {"industry": "Technology", "confidence": 0.5}  # Default fallback
-            
-            detected_industry = result.get("industry", "")
-            industry_confidence = result.get("confidence", 0.0)
-            
-            print(f"[API] Auto-detected industry: {detected_industry} (confidence: {industry_confidence:.2f})")
-            
-        except Exception as e:
-            print(f"[API] Industry detection failed: {e}")
-            # Provide smart fallback based on common company names
-            if req.client.lower() in ['apple', 'microsoft', 'google', 'amazon', 'tesla', 'meta', 'netflix']:
-                detected_industry = "Technology"
-                industry_confidence = 0.8
-                print(f"[API] Using fallback industry: {detected_industry}")
-            else:
-                detected_industry = ""
-                industry_confidence = None
-
-    # Select matching rows with reasoning
-    matched_rows = select_rows_for_summary(
-        client=req.client,
-        industry=detected_industry,
-        technology=req.technology,
-        focus=req.focus,
-        limit=req.limit
-    )
+        # Repeat lookups for the same client are served from the completion cache
+        cache_key, response_text = _cached_chat_content(ai_client, dict(
+            model=OPENAI_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=100,
+            temperature=0.1
+        ))
+        log.debug("[API] Raw OpenAI response: %s", response_text)
+        
+        # Try to extract JSON even if there's extra text
+        if '{' in response_text and '}' in response_text:
+            start = response_text.find('{')
+            end = response_text.rfind('}') + 1
+            json_text = response_text[start:end]
+            result = json.loads(json_text)
+            _store_completion(cache_key, response_text)
+        else:
+            result = {"industry": "Technology", "confidence": 0.5}  # Default fallback
+        
+        detected_industry = result.get("industry", "")
+        industry_confidence = result.get("confidence", 0.0)
+        
+        log.info("[API] Auto-detected industry: %s (confidence: %.2f)", detected_industry, industry_confidence)
+        
+    except Exception as e:
+        log.warning("[API] Industry detection failed: %s", e)
+        detected_industry = ""
+        industry_confidence = None
+    return detected_industry, industry_confidence
 
-    # Gather web intelligence (if not provided)
-    if req.intelligence_data and not req.intelligence_data.get("error"):
-        print(f"[API] Reusing provided intelligence data")
-        intelligence_data = req.intelligence_data
-    else:
-        print(f"[API] Gathering fresh intelligence...")
+@app.post("/portfolio_summary", response_model=PortfolioSummaryResponse)
+async def portfolio_summary(req: PortfolioRequest):
+    """Main endpoint: Search portfolio and gather intelligence."""
+    log.info("[API] Starting portfolio search for: %s", req.client)
+    
+    # Auto-detect industry if not provided
+    detected_industry = req.industry
+    industry_confidence = None
+    
+    if not req.industry and req.client:
+        detected_industry, industry_confidence = await asyncio.to_thread(_detect_portfolio_industry, req.client)
+
+    def gather_intelligence() -> Dict[str, Any]:
+        # Gather web intelligence (if not provided)
+        if req.intelligence_data and not req.intelligence_data.get("error"):
+            log.info("[API] Reusing provided intelligence data")
+            return req.intelligence_data
+        log.info("[API] Gathering fresh intelligence...")
         web_data = comprehensive_web_search(
             client=req.client,
             industry=detected_industry,
             focus=req.focus,
             company_website=req.company_website
         )
-        intelligence_data = ai_extract_intelligence(web_data)
-        intelligence_data = _normalize_legacy_intel(intelligence_data)
+        return _normalize_legacy_intel(ai_extract_intelligence(web_data))
 
-    print(f"[API] Returning {len(matched_rows)} matched rows with intelligence")
-    print("="*80 + "\n")
+    # Portfolio matching and web intelligence only share the detected industry, so run them together
+    matched_rows, intelligence_data = await asyncio.gather(
+        asyncio.to_thread(
+            select_rows_for_summary,
+            client=req.client,
+            industry=detected_industry,
+            technology=req.technology,
+            focus=req.focus,
+            limit=req.limit
+        ),
+        asyncio.to_thread(gather_intelligence),
+    )
+
+    log.info("[API] Returning %d matched rows with intelligence", len(matched_rows))
 
     return PortfolioSummaryResponse(
         short_summary="",
@@ -1814,23 +2617,20 @@ Do not include any explanation or additional text."""
 @app.post("/portfolio_summary_selected", response_model=PortfolioSummaryResponse)
 def portfolio_summary_selected(req: PortfolioSummarySelectedRequest):
     """Generate pitch from selected rows (reuses intelligence)."""
-    print("\n" + "="*80)
-    print(f"[API] Generating pitch for {req.client} with {len(req.rows)} selected rows")
-    print("="*80)
+    log.info("[API] Generating pitch for %s with %d selected rows", req.client, len(req.rows))
 
     # Use cached intelligence if provided
     if req.intelligence_data and not req.intelligence_data.get("error"):
-        print(f"[API] Reusing intelligence data from first fetch (no SerpAPI call)")
+        log.info("[API] Reusing intelligence data from first fetch (no SerpAPI call)")
         intelligence_data = req.intelligence_data
     else:
-        print(f"[API] Warning: No intelligence data provided, generating without context")
+        log.warning("[API] No intelligence data provided, generating without context")
         intelligence_data = None
 
     # Generate pitch
     pitch = openai_benefits_summary(req.client, req.rows, intelligence_data)
 
-    print(f"[API] Pitch generation complete")
-    print("="*80 + "\n")
+    log.info("[API] Pitch generation complete")
 
     return PortfolioSummaryResponse(
         short_summary=pitch.get("short", ""),
@@ -1840,39 +2640,98 @@ def portfolio_summary_selected(req: PortfolioSummarySelectedRequest):
         intelligence_data=intelligence_data
     )
 
-@app.post("/refine_pitch")
-def refine_pitch(req: PitchRefinementRequest):
+@app.post("/portfolio_summary_selected/stream")
+async def portfolio_summary_selected_stream(req: PortfolioSummarySelectedRequest):
     """
-    NEW ENDPOINT: Refine existing pitch based on user instructions.
-    Takes current pitch + refinement instructions -> generates improved version.
+    Streaming variant of /portfolio_summary_selected: returns the pitch JSON
+    ({"short", "long", "long_structured"}) as the model produces it so the UI can
+    show progress immediately. The complete body is the same JSON object that
+    openai_benefits_summary parses; it is cached so a repeat request is served at once.
+    If the stream breaks or the body is not valid JSON, a final line holds an error
+    object shaped like the blocking endpoint's ({"short", "long", "long_structured"})
+    plus "error": true, so the UI can tell a failed pitch from a complete one.
     """
-    print("\n" + "="*80)
-    print(f"[API] Refining pitch for {req.client}")
-    print(f"[Refinement] User instructions: {req.refinement_instructions[:100]}...")
-    print("="*80)
+    log.info("[API] Streaming pitch for %s with %d selected rows", req.client, len(req.rows))
 
     if not OPENAI_API_KEY:
         raise HTTPException(status_code=500, detail="OpenAI API key not configured")
 
+    intelligence_data = req.intelligence_data if req.intelligence_data and not req.intelligence_data.get("error") else None
+    request = _build_pitch_request(req.client, req.rows, intelligence_data)
+    cache_key = _completion_cache_key(request)
+    cached = _get_cached_completion(cache_key)
+    if cached is not None:
+        log.info("[LLM Cache] Reusing cached %s response", request.get('model'))
+        return StreamingResponse(iter([cached]), media_type="application/json")
+
+    ai_client = _async_openai_client()
     try:
-        ai_client = OpenAI(api_key=OPENAI_API_KEY)
+        stream = await ai_client.chat.completions.create(**request, stream=True)
+    except Exception as e:
+        log.warning("[Pitch Generation] Error: %s", e)
+        raise HTTPException(status_code=500, detail=f"Pitch generation failed: {str(e)}")
 
-        # Build context
-        evidence_summary = "\n".join([
-            f"- {r.get('client_name', '')}: {r.get('evoke_solution_/_value_add_to_the_customer_(what_/_how)', '')[:100]}"
-            for r in req.context_rows[:5]
-        ])
+    def error_line(short: str, long: str) -> str:
+        return "\n" + json.dumps({"short": short, "long": long, "long_structured": None, "error": True})
 
-        intelligence_summary = ""
-        if req.intelligence_data and not req.intelligence_data.get("error"):
-            intel_parts = []
-            if "financial_data" in req.intelligence_data:
-                intel_parts.append(f"Financial: {len(req.intelligence_data['financial_data'])} metrics")
-            if "technologies" in req.intelligence_data:
-                intel_parts.append(f"Technologies: {len(req.intelligence_data['technologies'])} identified")
-            intelligence_summary = ", ".join(intel_parts)
+    async def generate():
+        parts = []
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            log.warning("[Pitch Generation] Stream error: %s", e)
+            yield error_line(f"Error generating pitch: {str(e)}", "Please check API configuration and try again.")
+            return
+        content = "".join(parts).strip()
+        try:
+            json.loads(content)
+        except json.JSONDecodeError as e:
+            log.warning("[Pitch Generation] Streamed JSON Error: %s", e)
+            yield error_line(f"JSON parsing error: {str(e)}", "The API response was not valid JSON. Please try again.")
+            return
+        _store_completion(cache_key, content)
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+REFINEMENT_INSTRUCTIONS = """You are refining a presales pitch based on client feedback.
+
+TASK:
+Generate an IMPROVED pitch that:
+1. Preserves the core value propositions from the original
+2. Incorporates the user's requested changes/additions
+3. Maintains presales-grade professional tone
+4. Keeps the SHORT/LONG structure
+
+Return in this format:
 
-        refinement_prompt = f"""You are refining a presales pitch based on client feedback.
+SHORT PITCH:
+[improved 100-150 word version]
+
+LONG PITCH:
+[improved 400-600 word version with sections]"""
+
+def _build_refinement_prompt(req: PitchRefinementRequest) -> str:
+    """Build the pitch refinement prompt shared by /refine_pitch and /refine_pitch/stream."""
+    # Build context
+    evidence_summary = "\n".join([
+        f"- {_safe_str(r.get('client_name'))}: {_safe_str(r.get(VALUE_ADD_COLUMN))[:100]}"
+        for r in req.context_rows[:5]
+    ])
+
+    intelligence_summary = ""
+    if req.intelligence_data and not req.intelligence_data.get("error"):
+        intel_parts = []
+        if "financial_data" in req.intelligence_data:
+            intel_parts.append(f"Financial: {len(req.intelligence_data['financial_data'])} metrics")
+        if "technologies" in req.intelligence_data:
+            intel_parts.append(f"Technologies: {len(req.intelligence_data['technologies'])} identified")
+        intelligence_summary = ", ".join(intel_parts)
+
+    # Static instructions first, request-specific content last (prompt-cache friendly)
+    return f"""{REFINEMENT_INSTRUCTIONS}
 
 ORIGINAL PITCH:
 
@@ -1890,22 +2749,23 @@ CONTEXT:
 USER REFINEMENT INSTRUCTIONS:
 {req.refinement_instructions}
 
-TASK:
-Generate an IMPROVED pitch that:
-1. Preserves the core value propositions from the original
-2. Incorporates the user's requested changes/additions
-3. Maintains presales-grade professional tone
-4. Keeps the SHORT/LONG structure
-
-Return in this format:
+Generate the refined pitch now:"""
 
-SHORT PITCH:
-[improved 100-150 word version]
+@app.post("/refine_pitch")
+def refine_pitch(req: PitchRefinementRequest):
+    """
+    NEW ENDPOINT: Refine existing pitch based on user instructions.
+    Takes current pitch + refinement instructions -> generates improved version.
+    """
+    log.info("[API] Refining pitch for %s", req.client)
+    log.info("[Refinement] User instructions: %.100s...", req.refinement_instructions)
 
-LONG PITCH:
-[improved 400-600 word version with sections]
+    if not OPENAI_API_KEY:
+        raise HTTPException(status_code=500, detail="OpenAI API key not configured")
 
-Generate the refined pitch now:"""
+    try:
+        ai_client = _openai_client()
+        refinement_prompt = _build_refinement_prompt(req)
 
         response = ai_client.chat.completions.create(
             model=OPENAI_MODEL,
@@ -1928,8 +2788,7 @@ Generate the refined pitch now:"""
             short_section = parts[0] if parts else content[:500]
             long_section = "\n\n".join(parts[1:]) if len(parts) > 1 else content
 
-        print(f"[API] Pitch refinement complete")
-        print("="*80 + "\n")
+        log.info("[API] Pitch refinement complete")
 
         return {
             "short_summary": short_section,
@@ -1937,118 +2796,134 @@ Generate the refined pitch now:"""
         }
 
     except Exception as e:
-        print(f"[Pitch Refinement] Error: {e}")
+        log.error("[Pitch Refinement] Error: %s", e)
+        raise HTTPException(status_code=500, detail=f"Refinement failed: {str(e)}")
+
+@app.post("/refine_pitch/stream")
+async def refine_pitch_stream(req: PitchRefinementRequest):
+    """
+    Streaming variant of /refine_pitch: returns the refined pitch text as the model
+    produces it (same SHORT PITCH / LONG PITCH layout) so the UI can render the first
+    tokens immediately instead of waiting for the full completion.
+    """
+    log.info("[API] Streaming pitch refinement for %s", req.client)
+
+    if not OPENAI_API_KEY:
+        raise HTTPException(status_code=500, detail="OpenAI API key not configured")
+
+    ai_client = _async_openai_client()
+    try:
+        stream = await ai_client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[{"role": "user", "content": _build_refinement_prompt(req)}],
+            temperature=0.7,
+            max_tokens=2000,
+            stream=True
+        )
+    except Exception as e:
+        log.error("[Pitch Refinement] Error: %s", e)
         raise HTTPException(status_code=500, detail=f"Refinement failed: {str(e)}")
 
+    async def generate():
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            log.error("[Pitch Refinement] Stream error: %s", e)
+
+    return StreamingResponse(generate(), media_type="text/plain")
+
+# Markdown subset used by generated pitches: ## headings, - bullets, **bold**
+_MD_HEADING_RE = re.compile(r"^#{1,6}\s+(.*)$")
+_MD_BULLET_RE = re.compile(r"^\s*(?:[-*\u2022]|\d+[.)])\s+(.*)$")
+_MD_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+
+def _markdown_inline(text: str) -> str:
+    """Escape text for a reportlab Paragraph and turn **bold** into <b> tags."""
+    return _MD_BOLD_RE.sub(r"<b>\1</b>", xml_escape(text.strip()))
+
+def _markdown_flowables(text: str, styles: Any) -> List[Any]:
+    """Convert pitch markdown into reportlab flowables (headings, bullet lists, paragraphs)."""
+    flowables: List[Any] = []
+    paragraph: List[str] = []
+    bullets: List[str] = []
+
+    def flush():
+        if paragraph:
+            flowables.append(Paragraph("<br/>".join(paragraph), styles["BodyText"]))
+            paragraph.clear()
+        if bullets:
+            flowables.append(ListFlowable(
+                [ListItem(Paragraph(item, styles["BodyText"])) for item in bullets],
+                bulletType="bullet", leftIndent=12
+            ))
+            bullets.clear()
+
+    for line in text.splitlines():
+        heading = _MD_HEADING_RE.match(line)
+        bullet = _MD_BULLET_RE.match(line)
+        if not line.strip():
+            flush()
+        elif heading:
+            flush()
+            flowables.append(Paragraph(_markdown_inline(heading.group(1)), styles["Heading3"]))
+        elif bullet:
+            if paragraph:
+                flush()
+            bullets.append(_markdown_inline(bullet.group(1)))
+        else:
+            if bullets:
+                flush()
+            paragraph.append(_markdown_inline(line))
+    flush()
+    return flowables
+
+def _render_pitch_pdf(client: str, short_pitch: str, long_pitch: str, current_date: str) -> bytes:
+    """Lay out the pitch as a PDF document and return its bytes."""
+    styles = getSampleStyleSheet()
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, title=f"{client} - Presales Pitch", author="Evoke Technologies")
+    story = [
+        Paragraph(xml_escape(client), styles["Title"]),
+        Paragraph("Presales Pitch &amp; Value Proposition", styles["Heading4"]),
+        Paragraph(f"Generated on {current_date}", styles["Italic"]),
+        Spacer(1, 18),
+        Paragraph("Executive Summary", styles["Heading2"]),
+        *_markdown_flowables(short_pitch, styles),
+        Spacer(1, 12),
+        Paragraph("Detailed Proposal", styles["Heading2"]),
+        *_markdown_flowables(long_pitch, styles),
+        Spacer(1, 24),
+        Paragraph("Prepared by <b>Evoke Technologies</b> - Presales Assistant - AI-Powered Portfolio Intelligence", styles["Italic"]),
+    ]
+    doc.build(story)
+    return buffer.getvalue()
+
 @app.post("/download_pitch")
 def download_pitch(req: PitchDownloadRequest):
     """
     Generate and download pitch as PDF.
-    Returns a PDF file containing the formatted pitch content.
+    Returns a PDF file containing the formatted pitch content (plain text when
+    reportlab is not installed).
     """
-    print(f"[PDF Download] Generating PDF for {req.client}")
+    log.info("[PDF Download] Generating PDF for %s", req.client)
     
     try:
-        # Create HTML content for the pitch
         current_date = datetime.now().strftime("%B %d, %Y")
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>{req.client} - Presales Pitch</title>
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    line-height: 1.6;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 40px;
-                    color: #333;
-                }}
-                .header {{
-                    text-align: center;
-                    border-bottom: 3px solid #1976d2;
-                    padding-bottom: 20px;
-                    margin-bottom: 30px;
-                }}
-                .company-name {{
-                    font-size: 2.2em;
-                    color: #1976d2;
-                    margin: 0;
-                    font-weight: 700;
-                }}
-                .subtitle {{
-                    font-size: 1.2em;
-                    color: #666;
-                    margin: 10px 0;
-                }}
-                .date {{
-                    color: #888;
-                    font-size: 0.9em;
-                }}
-                .section {{
-                    margin: 30px 0;
-                    padding: 20px;
-                    border-left: 4px solid #1976d2;
-                    background: #f8f9fa;
-                }}
-                .section-title {{
-                    font-size: 1.4em;
-                    color: #1976d2;
-                    margin: 0 0 15px 0;
-                    font-weight: 600;
-                }}
-                .content {{
-                    margin: 15px 0;
-                    text-align: justify;
-                }}
-                .footer {{
-                    text-align: center;
-                    margin-top: 50px;
-                    padding-top: 20px;
-                    border-top: 1px solid #ddd;
-                    color: #666;
-                    font-size: 0.9em;
-                }}
-                .evoke-brand {{
-                    color: #1976d2;
-                    font-weight: 600;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1 class="company-name">{req.client}</h1>
-                <p class="subtitle">Presales Pitch & Value Proposition</p>
-                <p class="date">Generated on {current_date}</p>
-            </div>
-            
-            <div class="section">
-                <h2 class="section-title">Executive Summary</h2>
-                <div class="content">
-                    {req.short_pitch.replace('\\n', '<br>').replace('**', '<strong>').replace('**', '</strong>')}
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2 class="section-title">Detailed Proposal</h2>
-                <div class="content">
-                    {req.long_pitch.replace('\\n', '<br>').replace('**', '<strong>').replace('**', '</strong>')}
-                </div>
-            </div>
-            
-            <div class="footer">
-                <p>Prepared by <span class="evoke-brand">Evoke Technologies</span></p>
-                <p>Presales Assistant - AI-Powered Portfolio Intelligence</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Convert HTML to PDF-like format by returning formatted text
-        # Since we don't have PDF libraries, we'll return a structured text format
+
+        if REPORTLAB_AVAILABLE:
+            pdf_bytes = _render_pitch_pdf(req.client, req.short_pitch, req.long_pitch, current_date)
+            log.info("[PDF Download] Generated PDF for %s (%d bytes)", req.client, len(pdf_bytes))
+            return Response(
+                content=pdf_bytes,
+                media_type="application/pdf",
+                headers={
+                    "Content-Disposition": f"attachment; filename=\"{quote(req.client)}_pitch.pdf\""
+                }
+            )
+
+        # Without reportlab, fall back to a structured text file
         text_content = f"""
 {req.client.upper()} - PRESALES PITCH
 Generated on {current_date}
@@ -2067,21 +2942,20 @@ Prepared by Evoke Technologies
 Presales Assistant - AI-Powered Portfolio Intelligence
         """
         
-        # Create a simple text file as PDF alternative
         text_bytes = text_content.encode('utf-8')
         
-        print(f"[PDF Download] Generated document for {req.client} ({len(text_bytes)} bytes)")
+        log.info("[PDF Download] Generated document for %s (%d bytes)", req.client, len(text_bytes))
         
         return Response(
             content=text_bytes,
             media_type="application/octet-stream",
             headers={
-                "Content-Disposition": f"attachment; filename={req.client}_pitch.txt"
+                "Content-Disposition": f"attachment; filename=\"{quote(req.client)}_pitch.txt\""
             }
         )
         
     except Exception as e:
-        print(f"[PDF Download] Error: {e}")
+        log.error("[PDF Download] Error: %s", e)
         raise HTTPException(status_code=500, detail=f"PDF generation failed: {str(e)}")
 
 # ===================== STARTUP =====================
@@ -2099,4 +2973,11 @@ if __name__ == "__main__":
     print("  Web intelligence gathering")
     print("="*80 + "\n")
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Several workers need the import string; each worker loads its own portfolio and in-memory caches
+    workers = int(os.getenv("SERVER_WORKERS", "1"))
+    uvicorn.run(
+        "ff:app" if workers > 1 else app,
+        host=os.getenv("SERVER_HOST", "0.0.0.0"),
+        port=int(os.getenv("SERVER_PORT", "8000")),
+        workers=workers
+    )
@@ -6,15 +6,41 @@ Handles starting, stopping, and managing the application
 
 import os
 import sys
+import json
+import errno
+import shutil
 import subprocess
 import signal
+import socket
+import threading
+import selectors
 import time
-import webbrowser
 import platform
-import psutil
 from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import argparse
 
+# Resolved once; every helper branches on it
+_IS_WINDOWS = platform.system() == "Windows"
+
+# Fallback install directories for find_executable, with env vars expanded once at import
+if _IS_WINDOWS:
+    _COMMON_BIN_DIRS = [os.path.expandvars(p) for p in (
+        r"%PROGRAMFILES%\nodejs",
+        r"%PROGRAMFILES(X86)%\nodejs",
+        r"%APPDATA%\npm",
+        r"%USERPROFILE%\AppData\Roaming\npm",
+    )]
+else:
+    _COMMON_BIN_DIRS = [
+        "/usr/local/bin",
+        "/usr/bin",
+        "/opt/node/bin",
+        os.path.expanduser("~/.local/bin"),
+        os.path.expanduser("~/node_modules/.bin"),
+    ]
+
 class Colors:
     """ANSI color codes for cross-platform colored output"""
     HEADER = '\033[95m'
@@ -26,18 +52,27 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+def is_executable_file(path):
+    """Cheap runnable check (a stat, no --version spawn); Windows needs a launchable extension"""
+    if not os.path.isfile(path):
+        return False
+    if _IS_WINDOWS:
+        return path.lower().endswith(('.cmd', '.exe', '.bat'))
+    return os.access(path, os.X_OK)
+
+@lru_cache(maxsize=8)
 def find_executable(name):
-    """Find executable in PATH or common locations dynamically"""
+    """Find executable in PATH or common locations dynamically (memoized per run)"""
     # First try to find in PATH
     try:
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             result = subprocess.run(["where", name], capture_output=True, text=True, check=True)
         else:
             result = subprocess.run(["which", name], capture_output=True, text=True, check=True)
         
         # On Windows, prefer .cmd files
         paths = result.stdout.strip().split('\n')
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             cmd_paths = [p for p in paths if p.endswith('.cmd')]
             if cmd_paths:
                 return cmd_paths[0]
@@ -51,7 +86,7 @@ def find_executable(name):
         if node_path:
             node_dir = os.path.dirname(node_path)
             # On Windows, prioritize .cmd files
-            if platform.system() == "Windows":
+            if _IS_WINDOWS:
                 potential_npm_paths = [
                     os.path.join(node_dir, "npm.cmd"),
                     os.path.join(node_dir, "npm.exe"),
@@ -65,23 +100,12 @@ def find_executable(name):
                 ]
             
             for npm_path in potential_npm_paths:
-                if os.path.exists(npm_path):
-                    try:
-                        subprocess.run([npm_path, "--version"], capture_output=True, text=True, check=True)
-                        return npm_path
-                    except:
-                        continue
+                if is_executable_file(npm_path):
+                    return npm_path
     
     # Last resort: try common installation directories
-    if platform.system() == "Windows":
-        common_paths = [
-            os.path.expandvars(r"%PROGRAMFILES%\nodejs"),
-            os.path.expandvars(r"%PROGRAMFILES(X86)%\nodejs"),
-            os.path.expandvars(r"%APPDATA%\npm"),
-            os.path.expandvars(r"%USERPROFILE%\AppData\Roaming\npm"),
-        ]
-        
-        for base_path in common_paths:
+    if _IS_WINDOWS:
+        for base_path in _COMMON_BIN_DIRS:
             if os.path.exists(base_path):
                 # Prioritize .cmd files on Windows
                 potential_paths = [
@@ -91,36 +115,20 @@ def find_executable(name):
                 ]
                 
                 for path in potential_paths:
-                    if os.path.exists(path):
-                        try:
-                            subprocess.run([path, "--version"], capture_output=True, text=True, check=True)
-                            return path
-                        except:
-                            continue
+                    if is_executable_file(path):
+                        return path
     else:
         # Unix-like systems
-        common_paths = [
-            "/usr/local/bin",
-            "/usr/bin",
-            "/opt/node/bin",
-            os.path.expanduser("~/.local/bin"),
-            os.path.expanduser("~/node_modules/.bin"),
-        ]
-        
-        for base_path in common_paths:
+        for base_path in _COMMON_BIN_DIRS:
             path = os.path.join(base_path, name)
-            if os.path.exists(path):
-                try:
-                    subprocess.run([path, "--version"], capture_output=True, text=True, check=True)
-                    return path
-                except:
-                    continue
+            if is_executable_file(path):
+                return path
     
     return None
 
 def print_colored(message, color=Colors.OKGREEN):
     """Print colored message with fallback for Windows"""
-    if platform.system() == "Windows":
+    if _IS_WINDOWS:
         print(message)
     else:
         print(f"{color}{message}{Colors.ENDC}")
@@ -132,42 +140,102 @@ def print_header(title):
     print("="*80)
 
 def check_port(port):
-    """Check if a port is in use"""
+    """Check if a port is in use (something accepts connections on it)"""
     try:
-        import socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex(('localhost', port))
-        sock.close()
-        return result == 0
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.5)
+            return sock.connect_ex(('127.0.0.1', port)) == 0
     except:
         return False
 
-def find_processes_by_name(name):
-    """Find processes by name"""
-    processes = []
-    try:
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            if name.lower() in proc.info['name'].lower():
-                processes.append(proc)
-    except:
-        pass
-    return processes
+def check_ports(ports, timeout=0.5):
+    """Check several ports at once: non-blocking connects reaped by one selector wait; returns {port: in_use}"""
+    in_use = dict.fromkeys(ports, False)
+    with selectors.DefaultSelector() as sel:
+        for port in ports:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            err = sock.connect_ex(('127.0.0.1', port))
+            if err == 0:
+                in_use[port] = True
+                sock.close()
+            elif err in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, getattr(errno, "WSAEWOULDBLOCK", -1)):
+                sel.register(sock, selectors.EVENT_WRITE, port)
+            else:
+                sock.close()
+        
+        # A pending connect becomes writable once it either succeeds or fails
+        deadline = time.monotonic() + timeout
+        while sel.get_map() and (remaining := deadline - time.monotonic()) > 0:
+            for key, _ in sel.select(remaining):
+                in_use[key.data] = key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                sel.unregister(key.fileobj)
+                key.fileobj.close()
+        for key in list(sel.get_map().values()):
+            key.fileobj.close()
+    return in_use
+
+def wait_for_port(port, timeout, process=None, interval=0.05):
+    """Poll until something listens on `port`; gives up after `timeout` seconds or if `process` exits"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if check_port(port):
+            return True
+        if process is not None and process.poll() is not None:
+            return False
+        time.sleep(interval)
+    return check_port(port)
 
-def kill_processes_by_port(port):
-    """Kill processes using a specific port"""
+def wait_for_ports_free(ports, timeout=10.0, interval=0.05):
+    """Poll until none of `ports` accepts connections any more; gives up after `timeout` seconds"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not any(check_ports(ports).values()):
+            return True
+        time.sleep(interval)
+    return not any(check_ports(ports).values())
+
+# (process name, script) pairs that identify the server on each port, for when the
+# connection table cannot be read (psutil.net_connections needs root on macOS)
+_SERVER_PROCESS_MARKERS = {8000: ("python", "ff.py"), 3000: ("node", "react-scripts")}
+
+def find_server_pids_by_cmdline(ports):
+    """Map PIDs of the python/node processes running the server for one of `ports` to that port"""
+    import psutil
+    
+    targets = {}
+    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+        if proc.info['pid'] == os.getpid():
+            continue
+        name = (proc.info.get('name') or "").lower()
+        args = proc.info.get('cmdline') or []
+        for port in ports:
+            proc_name, script = _SERVER_PROCESS_MARKERS.get(port, (None, None))
+            if proc_name and proc_name in name and any(script in Path(arg).parts for arg in args[1:]):
+                targets.setdefault(proc.info['pid'], port)
+    return targets
+
+def kill_processes_by_ports(ports):
+    """Kill processes using any of the given ports ({port: label}) with one TCP connection-table scan"""
+    import psutil  # only stop/restart need it; keeps start/status/diagnose startup light
+    
+    targets = {}
     try:
-        for conn in psutil.net_connections():
-            if conn.laddr.port == port and conn.pid:
-                try:
-                    process = psutil.Process(conn.pid)
-                    process.terminate()
-                    print_colored(f"✓ Terminated process on port {port}", Colors.OKGREEN)
-                    return True
-                except:
-                    pass
-    except:
-        pass
-    return False
+        for conn in psutil.net_connections(kind='tcp'):
+            if conn.laddr and conn.laddr.port in ports and conn.pid:
+                targets.setdefault(conn.pid, conn.laddr.port)
+    except psutil.AccessDenied:
+        targets = find_server_pids_by_cmdline(ports)
+    
+    killed = False
+    for pid, port in targets.items():
+        try:
+            psutil.Process(pid).terminate()
+            print_colored(f"✓ Terminated {ports[port]} process on port {port}", Colors.OKGREEN)
+            killed = True
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return killed
 
 def start_backend():
     """Start the FastAPI backend server"""
@@ -185,7 +253,7 @@ def start_backend():
     
     # Start backend server
     try:
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             # On Windows, create new window
             backend_process = subprocess.Popen(
                 [sys.executable, "ff.py"],
@@ -199,10 +267,8 @@ def start_backend():
                 stderr=subprocess.DEVNULL
             )
         
-        # Wait a moment for server to start
-        time.sleep(3)
-        
-        if check_port(8000):
+        # Return as soon as the server accepts connections
+        if wait_for_port(8000, 15, backend_process):
             print_colored("✓ Backend server started on http://localhost:8000", Colors.OKGREEN)
             return backend_process
         else:
@@ -236,29 +302,24 @@ def start_frontend():
     
     # Start frontend server
     try:
-        original_dir = os.getcwd()
-        os.chdir(ui_dir)
-        
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             # On Windows, create new window
             frontend_process = subprocess.Popen(
                 [npm_path, "start"],
+                cwd=ui_dir,
                 creationflags=subprocess.CREATE_NEW_CONSOLE
             )
         else:
             # On Unix-like systems
             frontend_process = subprocess.Popen(
                 [npm_path, "start"],
+                cwd=ui_dir,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL
             )
         
-        os.chdir(original_dir)
-        
-        # Wait for frontend to start
-        time.sleep(5)
-        
-        if check_port(3000):
+        # Wait for the dev server to accept connections (the first compile can be slow)
+        if wait_for_port(3000, 60, frontend_process):
             print_colored("✓ Frontend server started on http://localhost:3000", Colors.OKGREEN)
             return frontend_process
         else:
@@ -273,45 +334,23 @@ def stop_servers():
     """Stop all servers"""
     print_header("STOPPING ALL SERVERS")
     
-    stopped = False
-    
-    # Stop backend (port 8000)
-    if check_port(8000):
-        if kill_processes_by_port(8000):
-            stopped = True
-    
-    # Stop frontend (port 3000)
-    if check_port(3000):
-        if kill_processes_by_port(3000):
-            stopped = True
-    
-    # Alternative method: kill by process name
-    python_processes = find_processes_by_name("python")
-    for proc in python_processes:
-        try:
-            if "ff.py" in " ".join(proc.info.get('cmdline', [])):
-                proc.terminate()
-                print_colored("✓ Terminated backend process", Colors.OKGREEN)
-                stopped = True
-        except:
-            pass
-    
-    node_processes = find_processes_by_name("node")
-    for proc in node_processes:
-        try:
-            cmdline = " ".join(proc.info.get('cmdline', []))
-            if "react-scripts" in cmdline or "npm" in cmdline:
-                proc.terminate()
-                print_colored("✓ Terminated frontend process", Colors.OKGREEN)
-                stopped = True
-        except:
-            pass
+    # Stop backend (port 8000) and frontend (port 3000) by the PIDs listening on them
+    stopped = kill_processes_by_ports({8000: "backend", 3000: "frontend"})
     
     if stopped:
         print_colored("✓ All servers stopped", Colors.OKGREEN)
     else:
         print_colored("ℹ No running servers found", Colors.WARNING)
 
+def remove_tree_in_background(path):
+    """Move a directory aside and delete it on a thread; returns the thread to join"""
+    trash = path.parent / f".{path.name}.trash.{os.getpid()}"
+    os.rename(path, trash)
+    thread = threading.Thread(target=shutil.rmtree, args=(trash,),
+                              kwargs={"ignore_errors": True})
+    thread.start()
+    return thread
+
 def repair_frontend():
     """Repair frontend dependencies and issues"""
     print_header("REPAIRING FRONTEND DEPENDENCIES")
@@ -321,227 +360,281 @@ def repair_frontend():
         print_colored("Frontend directory not found!", Colors.FAIL)
         return False
     
-    original_dir = os.getcwd()
-    os.chdir(ui_dir)
+    # Install missing dependencies
+    npm_path = find_executable("npm")
+    if not npm_path:
+        print_colored("npm not found!", Colors.FAIL)
+        return False
+    
+    # Finish deleting any node_modules left half-removed by an interrupted repair
+    for leftover in ui_dir.glob(".node_modules.trash.*"):
+        shutil.rmtree(leftover, ignore_errors=True)
     
+    # Check for Material-UI corruption by looking for common signs; one JSON listing of the
+    # top-level packages also tells us which Material-UI packages are there to remove
+    mui_corrupted = False
+    installed = {}
     try:
-        # Install missing dependencies
-        npm_path = find_executable("npm")
-        if not npm_path:
-            print_colored("npm not found!", Colors.FAIL)
-            return False
-        
-        # Check for Material-UI corruption by looking for common signs
-        mui_corrupted = False
-        try:
-            result = subprocess.run([npm_path, "list", "@mui/material"], 
-                                  capture_output=True, text=True, check=False)
-            if result.returncode != 0 or "ENOENT" in result.stderr:
-                mui_corrupted = True
-        except:
+        result = subprocess.run([npm_path, "list", "--json", "--depth=0"], 
+                              cwd=ui_dir, capture_output=True, text=True, check=False)
+        installed = json.loads(result.stdout or "{}").get("dependencies", {})
+        mui = installed.get("@mui/material")
+        if not mui or mui.get("missing") or mui.get("invalid") or "ENOENT" in result.stderr:
             mui_corrupted = True
+    except:
+        mui_corrupted = True
+    
+    # If Material-UI appears corrupted, do a clean reinstall
+    if mui_corrupted:
+        print_colored("Material-UI corruption detected. Performing clean reinstall...", Colors.WARNING)
         
-        # If Material-UI appears corrupted, do a clean reinstall
-        if mui_corrupted:
-            print_colored("Material-UI corruption detected. Performing clean reinstall...", Colors.WARNING)
-            
-            # Remove Material-UI packages
-            mui_packages = ["@mui/material", "@mui/icons-material", "@emotion/react", "@emotion/styled"]
-            for pkg in mui_packages:
-                try:
-                    subprocess.run([npm_path, "uninstall", pkg], 
-                                 capture_output=True, text=True, check=False)
+        # Remove whichever Material-UI packages are installed (one npm run resolves the tree once)
+        mui_packages = ["@mui/material", "@mui/icons-material", "@emotion/react", "@emotion/styled"]
+        present = [pkg for pkg in mui_packages if pkg in installed and not installed[pkg].get("missing")]
+        if present:
+            try:
+                subprocess.run([npm_path, "uninstall", *present], 
+                             cwd=ui_dir, capture_output=True, text=True, check=False)
+                for pkg in present:
                     print_colored(f"✓ Removed {pkg}", Colors.OKGREEN)
-                except:
-                    pass
-            
-            # Check if complete clean install is needed
-            node_modules = Path("node_modules")
-            if node_modules.exists() and any("ENOENT" in str(e) for e in []):
-                print_colored("Performing complete clean install...", Colors.WARNING)
-                try:
-                    import shutil
-                    if node_modules.exists():
-                        shutil.rmtree(node_modules)
-                    
-                    package_lock = Path("package-lock.json")
-                    if package_lock.exists():
-                        package_lock.unlink()
-                    
-                    print_colored("✓ Cleaned node_modules and package-lock.json", Colors.OKGREEN)
-                    
-                    # Reinstall all dependencies
-                    print_colored("Reinstalling all dependencies...", Colors.OKCYAN)
-                    result = subprocess.run([npm_path, "install"], 
-                                          capture_output=True, text=True, check=False)
-                    if result.returncode == 0:
-                        print_colored("✓ Complete reinstall successful", Colors.OKGREEN)
-                    else:
-                        print_colored("⚠ Reinstall had issues but continuing...", Colors.WARNING)
-                        
-                except Exception as e:
-                    print_colored(f"⚠ Clean install error: {e}", Colors.WARNING)
-        
-        print_colored("Installing/repairing critical dependencies...", Colors.OKCYAN)
-        critical_deps = [
-            # CSS and PostCSS (most common issue)
-            "@csstools/normalize.css@^12.1.1",
-            "postcss-normalize@^13.0.1",
-            
-            # Core MUI dependencies
-            "@mui/material@^7.3.2",
-            "@mui/icons-material@^7.3.2",
-            "@emotion/react@^11.14.0", 
-            "@emotion/styled@^11.14.1",
-            
-            # Essential utilities
-            "axios@^1.12.2",
-            "react-markdown@^10.1.0",
-            
-            # PDF and canvas utilities  
-            "jspdf@^3.0.3",
-            "html2canvas@^1.4.1",
-            
-            # Development tools
-            "concurrently@^9.2.1",
-            "web-vitals@^2.1.4"
-        ]
+            except:
+                pass
         
-        for dep in critical_deps:
+        # Check if complete clean install is needed
+        node_modules = ui_dir / "node_modules"
+        if node_modules.exists() and any("ENOENT" in str(e) for e in []):
+            print_colored("Performing complete clean install...", Colors.WARNING)
+            cleanup = None
             try:
-                result = subprocess.run([npm_path, "install", dep], 
-                                      capture_output=True, text=True, check=False)
-                dep_name = dep.split('@')[0]
+                # Renaming is instant; the unlinks overlap with npm install below
+                if node_modules.exists():
+                    cleanup = remove_tree_in_background(node_modules)
+                
+                package_lock = ui_dir / "package-lock.json"
+                if package_lock.exists():
+                    package_lock.unlink()
+                
+                print_colored("✓ Cleaned node_modules and package-lock.json", Colors.OKGREEN)
+                
+                # Reinstall all dependencies
+                print_colored("Reinstalling all dependencies...", Colors.OKCYAN)
+                result = subprocess.run([npm_path, "install"], 
+                                      cwd=ui_dir, capture_output=True, text=True, check=False)
                 if result.returncode == 0:
-                    print_colored(f"✓ Installed/verified {dep_name}", Colors.OKGREEN)
+                    print_colored("✓ Complete reinstall successful", Colors.OKGREEN)
                 else:
-                    print_colored(f"⚠ Issue with {dep_name}", Colors.WARNING)
+                    print_colored("⚠ Reinstall had issues but continuing...", Colors.WARNING)
+                    
             except Exception as e:
-                print_colored(f"⚠ Error installing {dep}: {e}", Colors.WARNING)
+                print_colored(f"⚠ Clean install error: {e}", Colors.WARNING)
+            finally:
+                if cleanup:
+                    cleanup.join()
+    
+    print_colored("Installing/repairing critical dependencies...", Colors.OKCYAN)
+    critical_deps = [
+        # CSS and PostCSS (most common issue)
+        "@csstools/normalize.css@^12.1.1",
+        "postcss-normalize@^13.0.1",
         
-        # Try to fix audit issues
-        print_colored("Attempting to fix security issues...", Colors.OKCYAN)
-        try:
-            subprocess.run([npm_path, "audit", "fix"], 
-                         capture_output=True, text=True, check=False)
-            print_colored("✓ Security audit completed", Colors.OKGREEN)
-        except:
-            print_colored("⚠ Could not run security audit", Colors.WARNING)
+        # Core MUI dependencies
+        "@mui/material@^7.3.2",
+        "@mui/icons-material@^7.3.2",
+        "@emotion/react@^11.14.0", 
+        "@emotion/styled@^11.14.1",
         
-        # Verify critical packages and detect corruption
-        print_colored("Verifying critical packages...", Colors.OKCYAN)
-        verification_packages = [
-            "@csstools/normalize.css",
-            "postcss-normalize",
-            "@mui/material", 
-            "react-markdown",
-            "axios"
-        ]
+        # Essential utilities
+        "axios@^1.12.2",
+        "react-markdown@^10.1.0",
         
-        corruption_detected = False
-        for pkg in verification_packages:
-            try:
-                result = subprocess.run([npm_path, "list", pkg], 
-                                      capture_output=True, text=True, check=False)
-                if result.returncode == 0 and "ENOENT" not in result.stderr:
-                    print_colored(f"✓ {pkg} verified", Colors.OKGREEN)
-                else:
-                    print_colored(f"⚠ {pkg} may need attention", Colors.WARNING)
-                    if "ENOENT" in result.stderr or "missing" in result.stderr.lower():
-                        corruption_detected = True
-            except:
-                print_colored(f"⚠ Could not verify {pkg}", Colors.WARNING)
+        # PDF and canvas utilities  
+        "jspdf@^3.0.3",
+        "html2canvas@^1.4.1",
         
-        # Special check for Material-UI ESM files
-        mui_esm_check = Path("node_modules/@mui/material/esm")
-        if mui_esm_check.exists():
-            # Check for common missing files that cause compilation errors
-            critical_files = [
-                "node_modules/@mui/material/esm/Paper/index.js",
-                "node_modules/@mui/material/esm/ButtonBase/index.js", 
-                "node_modules/@mui/material/esm/CircularProgress/index.js"
-            ]
-            
-            missing_files = []
-            for file_path in critical_files:
-                if not Path(file_path).exists():
-                    missing_files.append(file_path)
-            
-            if missing_files:
-                print_colored("⚠ Material-UI ESM files corruption detected!", Colors.WARNING)
-                print_colored("Run 'python run.py repair' again or do a manual clean install", Colors.WARNING)
-                corruption_detected = True
+        # Development tools
+        "concurrently@^9.2.1",
+        "web-vitals@^2.1.4"
+    ]
+    
+    # Install all of them in a single npm run instead of one dependency-tree resolution per package
+    try:
+        result = subprocess.run([npm_path, "install", *critical_deps], 
+                              cwd=ui_dir, capture_output=True, text=True, check=False)
+        if result.returncode == 0:
+            for dep in critical_deps:
+                print_colored(f"✓ Installed/verified {dep.rsplit('@', 1)[0]}", Colors.OKGREEN)
+        else:
+            print_colored("⚠ Issue installing critical dependencies:", Colors.WARNING)
+            print(result.stderr.strip()[-1000:])
+    except Exception as e:
+        print_colored(f"⚠ Error installing critical dependencies: {e}", Colors.WARNING)
+    
+    # Try to fix audit issues
+    print_colored("Attempting to fix security issues...", Colors.OKCYAN)
+    try:
+        subprocess.run([npm_path, "audit", "fix"], 
+                     cwd=ui_dir, capture_output=True, text=True, check=False)
+        print_colored("✓ Security audit completed", Colors.OKGREEN)
+    except:
+        print_colored("⚠ Could not run security audit", Colors.WARNING)
+    
+    # Verify critical packages and detect corruption
+    print_colored("Verifying critical packages...", Colors.OKCYAN)
+    verification_packages = [
+        "@csstools/normalize.css",
+        "postcss-normalize",
+        "@mui/material", 
+        "react-markdown",
+        "axios"
+    ]
+    
+    corruption_detected = False
+    try:
+        # One `npm list` for all packages; the JSON report covers each of them
+        result = subprocess.run([npm_path, "list", *verification_packages, "--depth=0", "--json"], 
+                              cwd=ui_dir, capture_output=True, text=True, check=False)
+        installed = json.loads(result.stdout or "{}").get("dependencies", {})
+        for pkg in verification_packages:
+            info = installed.get(pkg)
+            if info and not info.get("missing") and not info.get("invalid"):
+                print_colored(f"✓ {pkg} verified", Colors.OKGREEN)
             else:
-                print_colored("✓ Material-UI ESM files verified", Colors.OKGREEN)
+                print_colored(f"⚠ {pkg} may need attention", Colors.WARNING)
+                if not info or info.get("missing"):
+                    corruption_detected = True
+    except:
+        print_colored("⚠ Could not verify critical packages", Colors.WARNING)
+    
+    # Special check for Material-UI ESM files
+    mui_esm_check = ui_dir / "node_modules/@mui/material/esm"
+    if mui_esm_check.exists():
+        # Check for common missing files that cause compilation errors
+        critical_files = [
+            "node_modules/@mui/material/esm/Paper/index.js",
+            "node_modules/@mui/material/esm/ButtonBase/index.js", 
+            "node_modules/@mui/material/esm/CircularProgress/index.js"
+        ]
         
-        if corruption_detected:
-            print_colored("\n⚠ Package corruption detected! If issues persist:", Colors.WARNING)
-            print_colored("1. Run: python run.py repair", Colors.WARNING)
-            print_colored("2. Or manually: cd presales-assistant-ui && npm run clean && npm install", Colors.WARNING)
+        missing_files = []
+        for file_path in critical_files:
+            if not (ui_dir / file_path).exists():
+                missing_files.append(file_path)
         
-        return True
-    finally:
-        os.chdir(original_dir)
+        if missing_files:
+            print_colored("⚠ Material-UI ESM files corruption detected!", Colors.WARNING)
+            print_colored("Run 'python run.py repair' again or do a manual clean install", Colors.WARNING)
+            corruption_detected = True
+        else:
+            print_colored("✓ Material-UI ESM files verified", Colors.OKGREEN)
+    
+    if corruption_detected:
+        print_colored("\n⚠ Package corruption detected! If issues persist:", Colors.WARNING)
+        print_colored("1. Run: python run.py repair", Colors.WARNING)
+        print_colored("2. Or manually: cd presales-assistant-ui && npm run clean && npm install", Colors.WARNING)
+    
+    return True
+
+# (path, display name, description) checked by diagnose_system
+PROJECT_FILES = [
+    (Path(file), file, description) for file, description in {
+        "ff.py": "Backend main file",
+        "Project_Portfolio_Data.xlsx": "Portfolio data",
+        ".env": "Environment configuration",
+        "presales-assistant-ui/package.json": "Frontend configuration"
+    }.items()
+]
+
+def existing_paths(paths):
+    """Which of `paths` exist, using one directory scan per parent instead of a stat per path"""
+    listings = {}
+    found = set()
+    for path in paths:
+        parent = path.parent
+        if parent not in listings:
+            try:
+                with os.scandir(parent) as entries:
+                    listings[parent] = {entry.name for entry in entries}
+            except OSError:
+                listings[parent] = set()
+        if path.name in listings[parent]:
+            found.add(path)
+    return found
+
+def parse_env(path=Path(".env")):
+    """Read KEY=VALUE pairs from a dotenv file in one pass (no python-dotenv import); {} if it is missing"""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return {}
+    settings = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        key, value = line.split('=', 1)
+        key = key.strip()
+        if key.startswith('export '):
+            key = key[len('export '):].strip()
+        settings[key] = value.strip().strip('"\'')
+    return settings
+
+def probe_version(path):
+    """Return the stripped `<path> --version` output"""
+    return subprocess.run([path, "--version"], capture_output=True, text=True).stdout.strip()
 
 def diagnose_system():
     """Run system diagnostics"""
     print_header("SYSTEM DIAGNOSTICS")
     
+    # Locate node/npm and run the three version probes concurrently; results print in order
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        python_probe = pool.submit(probe_version, sys.executable)
+        node_path, npm_path = pool.map(find_executable, ["node", "npm"])
+        node_probe = pool.submit(probe_version, node_path) if node_path else None
+        npm_probe = pool.submit(probe_version, npm_path) if npm_path else None
+    
     # Check Python
     try:
-        python_version = subprocess.run([sys.executable, "--version"], 
-                                      capture_output=True, text=True)
-        print_colored(f"✓ Python: {python_version.stdout.strip()}", Colors.OKGREEN)
+        print_colored(f"✓ Python: {python_probe.result()}", Colors.OKGREEN)
     except:
         print_colored("✗ Python issue", Colors.FAIL)
     
     # Check Node.js
-    node_path = find_executable("node")
     if node_path:
         try:
-            node_version = subprocess.run([node_path, "--version"], 
-                                        capture_output=True, text=True)
-            print_colored(f"✓ Node.js: {node_version.stdout.strip()} (found at: {node_path})", Colors.OKGREEN)
+            print_colored(f"✓ Node.js: {node_probe.result()} (found at: {node_path})", Colors.OKGREEN)
         except:
             print_colored("✗ Node.js not working", Colors.FAIL)
     else:
         print_colored("✗ Node.js not found", Colors.FAIL)
     
     # Check npm
-    npm_path = find_executable("npm")
     if npm_path:
         try:
-            npm_version = subprocess.run([npm_path, "--version"], 
-                                       capture_output=True, text=True)
-            print_colored(f"✓ npm: {npm_version.stdout.strip()} (found at: {npm_path})", Colors.OKGREEN)
+            print_colored(f"✓ npm: {npm_probe.result()} (found at: {npm_path})", Colors.OKGREEN)
         except:
             print_colored("✗ npm not working", Colors.FAIL)
     else:
         print_colored("✗ npm not found", Colors.FAIL)
     
     # Check project files
-    files_to_check = {
-        "ff.py": "Backend main file",
-        "Project_Portfolio_Data.xlsx": "Portfolio data",
-        ".env": "Environment configuration",
-        "presales-assistant-ui/package.json": "Frontend configuration"
-    }
-    
     print_colored("\nProject Files:", Colors.OKCYAN)
-    for file, description in files_to_check.items():
-        if Path(file).exists():
+    present = existing_paths(path for path, _, _ in PROJECT_FILES)
+    for path, file, description in PROJECT_FILES:
+        if path in present:
             print_colored(f"✓ {description} ({file})", Colors.OKGREEN)
         else:
             print_colored(f"✗ {description} missing ({file})", Colors.FAIL)
     
     # Check ports
     print_colored("\nPort Status:", Colors.OKCYAN)
-    if check_port(8000):
+    ports = check_ports([8000, 3000])
+    if ports[8000]:
         print_colored("✓ Port 8000 in use (backend likely running)", Colors.OKGREEN)
     else:
         print_colored("ℹ Port 8000 available", Colors.WARNING)
     
-    if check_port(3000):
+    if ports[3000]:
         print_colored("✓ Port 3000 in use (frontend likely running)", Colors.OKGREEN)
     else:
         print_colored("ℹ Port 3000 available", Colors.WARNING)
@@ -549,16 +642,16 @@ def diagnose_system():
     # Check .env file
     print_colored("\nEnvironment Configuration:", Colors.OKCYAN)
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
+        # Same precedence as load_dotenv(): variables already in the environment win
+        settings = {**parse_env(), **os.environ}
         
-        api_key = os.getenv('OPENAI_API_KEY', '')
+        api_key = settings.get('OPENAI_API_KEY', '')
         if api_key and api_key != 'your_openai_api_key_here':
             print_colored("✓ OpenAI API key configured", Colors.OKGREEN)
         else:
             print_colored("⚠ OpenAI API key needs configuration", Colors.WARNING)
         
-        model = os.getenv('OPENAI_MODEL', '')
+        model = settings.get('OPENAI_MODEL', '')
         if model:
             print_colored(f"✓ OpenAI model: {model}", Colors.OKGREEN)
         
@@ -573,22 +666,27 @@ def start_application():
     if not Path(".env").exists():
         print_colored("Warning: .env file not found. Run 'python setup.py' first.", Colors.WARNING)
     
-    # Start backend
-    backend_result = start_backend()
-    if backend_result is None:
-        print_colored("Failed to start backend", Colors.FAIL)
-        return
-    
-    # Start frontend
-    frontend_result = start_frontend()
-    if frontend_result is None:
-        print_colored("Failed to start frontend", Colors.FAIL)
-        return
+    # Fast path: both servers are already up, nothing to launch or wait for
+    if all(check_ports([8000, 3000]).values()):
+        print_colored("✓ Both servers already running", Colors.OKGREEN)
+        backend_result = frontend_result = "already_running"
+    else:
+        # Start backend
+        backend_result = start_backend()
+        if backend_result is None:
+            print_colored("Failed to start backend", Colors.FAIL)
+            return
+        
+        # Start frontend
+        frontend_result = start_frontend()
+        if frontend_result is None:
+            print_colored("Failed to start frontend", Colors.FAIL)
+            return
     
     # Open browser
     print_colored("Opening browser...", Colors.OKCYAN)
-    time.sleep(2)
     try:
+        import webbrowser
         webbrowser.open("http://localhost:3000")
         print_colored("✓ Browser opened", Colors.OKGREEN)
     except:
@@ -610,7 +708,7 @@ def start_application():
     
     print_colored("✓ Browser opened automatically", Colors.OKGREEN)
     
-    if platform.system() != "Windows":
+    if not _IS_WINDOWS:
         print("\nTo stop the application, run: python run.py stop")
         print("Or press Ctrl+C in the terminal windows")
 
@@ -641,7 +739,9 @@ def main():
         stop_servers()
     elif args.command == "restart":
         stop_servers()
-        time.sleep(2)
+        # Start as soon as the old servers have released their ports
+        if not wait_for_ports_free([8000, 3000]):
+            print_colored("⚠ Ports still in use after stopping; starting anyway", Colors.WARNING)
         start_application()
     elif args.command == "status":
         diagnose_system()
@@ -9,7 +9,37 @@ import sys
 import subprocess
 import platform
 import json
+import shutil
+import importlib
+import argparse
 from pathlib import Path
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from importlib.metadata import version, PackageNotFoundError
+
+# Optional: colorama makes classic Windows consoles render the ANSI color codes
+try:
+    import colorama
+    COLORAMA_AVAILABLE = True
+except ImportError:
+    COLORAMA_AVAILABLE = False
+
+# Versions from the last successful prerequisite check, keyed by the executables' paths and mtimes
+PREREQ_STAMP = Path.home() / ".cache" / "presales-setup" / "prereq.json"
+
+# pip of the interpreter running setup (argv prefix) and the frontend project directory
+PIP = [sys.executable, "-m", "pip"]
+UI_DIR = Path("presales-assistant-ui")
+CONSTRAINTS_FILE = Path(__file__).resolve().parent / "constraints.txt"
+
+# Oldest pip trusted to resolve the package list; anything older is upgraded before the retry
+MIN_PIP_VERSION = (23, 0)
+
+# Decided once at import: color everywhere except on Windows without colorama
+if platform.system() == "Windows" and COLORAMA_AVAILABLE:
+    getattr(colorama, "just_fix_windows_console", colorama.init)()
+_USE_COLOR = platform.system() != "Windows" or COLORAMA_AVAILABLE
 
 class Colors:
     """ANSI color codes for cross-platform colored output"""
@@ -22,24 +52,21 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+def is_executable_file(path):
+    """Cheap runnable check (a stat, no --version spawn); Windows needs a launchable extension"""
+    if not os.path.isfile(path):
+        return False
+    if platform.system() == "Windows":
+        return path.lower().endswith(('.cmd', '.exe', '.bat'))
+    return os.access(path, os.X_OK)
+
+@lru_cache(maxsize=None)
 def find_executable(name):
-    """Find executable in PATH or common locations dynamically"""
-    # First try to find in PATH
-    try:
-        if platform.system() == "Windows":
-            result = subprocess.run(["where", name], capture_output=True, text=True, check=True)
-        else:
-            result = subprocess.run(["which", name], capture_output=True, text=True, check=True)
-        
-        # On Windows, prefer .cmd files
-        paths = result.stdout.strip().split('\n')
-        if platform.system() == "Windows":
-            cmd_paths = [p for p in paths if p.endswith('.cmd')]
-            if cmd_paths:
-                return cmd_paths[0]
-        return paths[0]
-    except:
-        pass
+    """Find executable in PATH or common locations dynamically (memoized per run)"""
+    # First try to find in PATH (in-process walk, honours PATHEXT on Windows)
+    path = shutil.which(name)
+    if path and is_executable_file(path):
+        return path
     
     # If not found in PATH, try to find node first and derive npm location
     if name == "npm":
@@ -61,12 +88,8 @@ def find_executable(name):
                 ]
             
             for npm_path in potential_npm_paths:
-                if os.path.exists(npm_path):
-                    try:
-                        subprocess.run([npm_path, "--version"], capture_output=True, text=True, check=True)
-                        return npm_path
-                    except:
-                        continue
+                if is_executable_file(npm_path):
+                    return npm_path
     
     # Last resort: try common installation directories
     if platform.system() == "Windows":
@@ -87,12 +110,8 @@ def find_executable(name):
                 ]
                 
                 for path in potential_paths:
-                    if os.path.exists(path):
-                        try:
-                            subprocess.run([path, "--version"], capture_output=True, text=True, check=True)
-                            return path
-                        except:
-                            continue
+                    if is_executable_file(path):
+                        return path
     else:
         # Unix-like systems
         common_paths = [
@@ -105,17 +124,13 @@ def find_executable(name):
         
         for base_path in common_paths:
             path = os.path.join(base_path, name)
-            if os.path.exists(path):
-                try:
-                    subprocess.run([path, "--version"], capture_output=True, text=True, check=True)
-                    return path
-                except:
-                    continue
+            if is_executable_file(path):
+                return path
     
     return None
 
-def run_npm_command(args, description, check=True):
-    """Run npm command with dynamic path detection"""
+def run_npm_command(args, description, check=True, cwd=None):
+    """Run npm command with dynamic path detection (in `cwd` when given)"""
     npm_path = find_executable("npm")
     if not npm_path:
         print_colored(f"✗ {description} failed - npm not found", Colors.FAIL)
@@ -123,7 +138,7 @@ def run_npm_command(args, description, check=True):
     
     try:
         command = [npm_path] + args
-        result = subprocess.run(command, check=check, capture_output=True, text=True)
+        result = subprocess.run(command, cwd=cwd, check=check, capture_output=True, text=True)
         
         if result.returncode == 0:
             print_colored(f"✓ {description} completed successfully", Colors.OKGREEN)
@@ -144,10 +159,10 @@ def run_npm_command(args, description, check=True):
 
 def print_colored(message, color=Colors.OKGREEN):
     """Print colored message with fallback for Windows"""
-    if platform.system() == "Windows":
-        print(message)
-    else:
+    if _USE_COLOR:
         print(f"{color}{message}{Colors.ENDC}")
+    else:
+        print(message)
 
 def print_header(title):
     """Print formatted header"""
@@ -155,56 +170,82 @@ def print_header(title):
     print_colored(f"  {title}", Colors.HEADER)
     print("="*80)
 
-def run_command(command, description, check=True):
-    """Run a command with description and error handling"""
+def run_command(command, description, check=True, env=None):
+    """Run an argv list (no shell) with description and error handling, streaming its output live"""
     print_colored(f"\n[RUNNING] {description}...", Colors.OKCYAN)
     
+    # Echo output line by line as it arrives; only the last lines are kept for the error report
+    tail = deque(maxlen=50)
     try:
-        if isinstance(command, str):
-            result = subprocess.run(command, shell=True, check=check, 
-                                  capture_output=True, text=True)
-        else:
-            result = subprocess.run(command, check=check, 
-                                  capture_output=True, text=True)
+        with subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              text=True, bufsize=1) as proc:
+            for line in proc.stdout:
+                sys.stdout.write(line)
+                tail.append(line)
         
-        if result.returncode == 0:
+        if proc.returncode == 0:
             print_colored(f"✓ {description} completed successfully", Colors.OKGREEN)
             return True
+        elif check:
+            print_colored(f"✗ {description} failed", Colors.FAIL)
+            print(f"Error: exit status {proc.returncode}\n{''.join(tail)}")
+            return False
         else:
             print_colored(f"⚠ {description} completed with warnings", Colors.WARNING)
-            if result.stderr:
-                print(f"Warning: {result.stderr}")
+            if tail:
+                print(f"Warning: {''.join(tail)}")
             return False
             
-    except subprocess.CalledProcessError as e:
-        print_colored(f"✗ {description} failed", Colors.FAIL)
-        print(f"Error: {e}")
-        return False
     except FileNotFoundError:
         print_colored(f"✗ Command not found for {description}", Colors.FAIL)
         return False
 
+def probe_version(path):
+    """Return the stripped `<path> --version` output"""
+    return subprocess.run([path, "--version"], capture_output=True, text=True).stdout.strip()
+
+def prerequisite_key(paths):
+    """[[path, mtime], ...] for the given executables, or None if one is missing"""
+    try:
+        return [[path, os.path.getmtime(path)] for path in paths]
+    except (TypeError, OSError):
+        return None
+
 def check_prerequisites():
     """Check if Python and Node.js are installed"""
     print_header("CHECKING PREREQUISITES")
     
+    node_path, npm_path = find_executable("node"), find_executable("npm")
+    
+    # Same executables as the last successful check (paths and mtimes unchanged): reuse its versions
+    key = prerequisite_key([sys.executable, node_path, npm_path])
+    try:
+        stamp = json.loads(PREREQ_STAMP.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        stamp = {}
+    if key and stamp.get("key") == key:
+        for tool, tool_version in stamp["versions"].items():
+            print_colored(f"✓ {tool}: {tool_version} (cached)", Colors.OKGREEN)
+        return True
+    
+    # Run the three version probes concurrently; results print in order
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        python_probe = pool.submit(probe_version, sys.executable)
+        node_probe = pool.submit(probe_version, node_path) if node_path else None
+        npm_probe = pool.submit(probe_version, npm_path) if npm_path else None
+    
     # Check Python
     try:
-        python_version = subprocess.run([sys.executable, "--version"], 
-                                      capture_output=True, text=True)
-        print_colored(f"✓ Python: {python_version.stdout.strip()}", Colors.OKGREEN)
+        print_colored(f"✓ Python: {python_probe.result()}", Colors.OKGREEN)
         python_ok = True
     except:
         print_colored("✗ Python not found", Colors.FAIL)
         python_ok = False
     
     # Check Node.js
-    node_path = find_executable("node")
-    if node_path:
+    if node_probe:
         try:
-            node_version = subprocess.run([node_path, "--version"], 
-                                        capture_output=True, text=True)
-            print_colored(f"✓ Node.js: {node_version.stdout.strip()}", Colors.OKGREEN)
+            print_colored(f"✓ Node.js: {node_probe.result()}", Colors.OKGREEN)
             node_ok = True
         except:
             print_colored("✗ Node.js not working", Colors.FAIL)
@@ -214,12 +255,9 @@ def check_prerequisites():
         node_ok = False
     
     # Check npm
-    npm_path = find_executable("npm")
-    if npm_path:
+    if npm_probe:
         try:
-            npm_version = subprocess.run([npm_path, "--version"], 
-                                       capture_output=True, text=True)
-            print_colored(f"✓ npm: {npm_version.stdout.strip()}", Colors.OKGREEN)
+            print_colored(f"✓ npm: {npm_probe.result()}", Colors.OKGREEN)
             npm_ok = True
         except:
             print_colored("✗ npm not working", Colors.FAIL)
@@ -236,8 +274,31 @@ def check_prerequisites():
             print("- Node.js 16+ (includes npm): https://nodejs.org/")
         return False
     
+    # Remember the versions for the next run (best effort; a read-only home just means no cache)
+    if key:
+        versions = {"Python": python_probe.result(), "Node.js": node_probe.result(), "npm": npm_probe.result()}
+        try:
+            PREREQ_STAMP.parent.mkdir(parents=True, exist_ok=True)
+            PREREQ_STAMP.write_text(json.dumps({"key": key, "versions": versions}), encoding="utf-8")
+        except OSError:
+            pass
+    
     return True
 
+def pip_is_outdated():
+    """True when the installed pip is older than MIN_PIP_VERSION (read from metadata, no subprocess)"""
+    try:
+        installed = tuple(int(part) for part in version("pip").split(".")[:2])
+    except (PackageNotFoundError, ValueError):
+        return True
+    return installed < MIN_PIP_VERSION
+
+def pip_supports_fast_deps():
+    """True when this pip still accepts --use-feature=fast-deps (an unknown feature is a usage error)"""
+    result = subprocess.run([*PIP, "install", "--use-feature=fast-deps", "--help"],
+                            capture_output=True, text=True, check=False)
+    return result.returncode == 0
+
 def install_python_dependencies():
     """Install Python dependencies"""
     print_header("INSTALLING PYTHON DEPENDENCIES")
@@ -258,94 +319,147 @@ def install_python_dependencies():
         "python-dotenv"
     ]
     
-    # Try pip install with packages
-    package_list = " ".join(packages)
-    success = run_command(f"{sys.executable} -m pip install {package_list}", 
-                         "Installing Python packages", check=False)
+    # No PyPI self-version check, never wait on a prompt, and give up on a dead connection
+    # after 2 retries instead of pip's default 5, for every pip run below
+    pip_env = {**os.environ, "PIP_DISABLE_PIP_VERSION_CHECK": "1", "PIP_NO_INPUT": "1", "PIP_RETRIES": "2"}
+    
+    # Pinned known-good versions (shipped next to this script) spare the resolver its PyPI search
+    constraints = ["-c", str(CONSTRAINTS_FILE)] if CONSTRAINTS_FILE.exists() else []
+    
+    # uv (when installed) resolves and downloads in parallel; pip below stays the fallback
+    uv_path = find_executable("uv")
+    success = uv_path is not None and run_command(
+        [uv_path, "pip", "install", "--python", sys.executable, *constraints, *packages],
+        "Installing Python packages with uv", check=False)
+    
+    # Try pip install with packages: wheels only first, so nothing is compiled locally;
+    # fast-deps reads wheel metadata with range requests instead of downloading whole wheels
+    # while resolving; it is probed first so a pip that dropped the feature still gets the
+    # wheels-only attempt instead of going straight to source builds
+    pip_install = [*PIP, "install", "--prefer-binary", "--no-compile", *constraints]
+    if not success:
+        fast_deps = ["--use-feature=fast-deps"] if pip_supports_fast_deps() else []
+        success = run_command([*pip_install, "--only-binary=:all:", *fast_deps, *packages], 
+                             "Installing Python packages (wheels only)", check=False, env=pip_env)
+    
+    # The retry also rides out a flaky network (more retries, longer socket timeout) before
+    # anything heavier such as upgrading pip is tried
+    if not success:
+        print_colored("Retrying with source builds allowed...", Colors.WARNING)
+        success = run_command([*pip_install, "--retries", "3", "--timeout", "30", *packages], 
+                             "Installing Python packages", check=False, env=pip_env)
     
     if not success:
         print_colored("Trying alternative installation method...", Colors.WARNING)
-        run_command(f"{sys.executable} -m pip install --upgrade pip", 
-                   "Upgrading pip")
+        if pip_is_outdated():
+            run_command([*PIP, "install", "--upgrade", "pip"], 
+                       "Upgrading pip", env=pip_env)
         
         # Try installing from requirements.txt if it exists
         if Path("requirements.txt").exists():
-            run_command(f"{sys.executable} -m pip install -r requirements.txt", 
-                       "Installing from requirements.txt", check=False)
+            run_command([*PIP, "install", "-r", "requirements.txt"], 
+                       "Installing from requirements.txt", check=False, env=pip_env)
     
     return True
 
-def install_node_dependencies():
-    """Install Node.js dependencies"""
+def node_modules_up_to_date():
+    """True when the last npm install happened after package.json and package-lock.json last changed"""
+    try:
+        installed = (UI_DIR / "node_modules" / ".package-lock.json").stat().st_mtime
+        return all(installed > (UI_DIR / manifest).stat().st_mtime
+                   for manifest in ("package.json", "package-lock.json"))
+    except OSError:
+        return False
+
+def install_node_dependencies(audit=False):
+    """Install Node.js dependencies (`audit` also runs `npm audit fix`)"""
     print_header("INSTALLING NODE.JS DEPENDENCIES")
     
-    ui_dir = Path("presales-assistant-ui")
-    if not ui_dir.exists():
+    if not UI_DIR.exists():
         print_colored("Frontend directory not found!", Colors.FAIL)
         return False
     
-    # Change to UI directory and install
-    original_dir = os.getcwd()
-    os.chdir(ui_dir)
-    
-    try:
-        # First, install main dependencies from package.json
-        success = run_npm_command(["install"], "Installing Node.js packages from package.json", check=False)
+    # npm rewrites node_modules/.package-lock.json on every install; if that is newer than both
+    # manifests, the tree already matches them (a missing file means install for real)
+    if not audit and node_modules_up_to_date():
+        print_colored("✓ node_modules up-to-date", Colors.OKGREEN)
+        return True
+    
+    # npm runs with cwd=UI_DIR; chdir is process-wide and main() installs pip packages in parallel
+    
+    # First, install main dependencies: `npm ci` replays package-lock.json without resolving;
+    # without a lockfile (or when it is out of sync with package.json) fall back to `npm install`
+    quiet = ["--no-audit", "--no-fund", "--prefer-offline"]
+    success = False
+    if (UI_DIR / "package-lock.json").exists():
+        success = run_npm_command(["ci", *quiet], "Installing Node.js packages from package-lock.json",
+                                  check=False, cwd=UI_DIR)
+    if not success:
+        success = run_npm_command(["install", *quiet], "Installing Node.js packages from package.json",
+                                  check=False, cwd=UI_DIR)
+    
+    # Install critical dependencies that are commonly missing
+    critical_deps = [
+        # CSS and PostCSS dependencies (most common issues)
+        "@csstools/normalize.css@^12.1.1",
+        "postcss-normalize@^13.0.1",
         
-        if not success:
-            print_colored("Trying with --force flag...", Colors.WARNING)
-            success = run_npm_command(["install", "--force"], "Installing with force", check=False)
+        # Core MUI dependencies
+        "@mui/material@^7.3.2",
+        "@mui/icons-material@^7.3.2", 
+        "@emotion/react@^11.14.0",
+        "@emotion/styled@^11.14.1",
         
-        # Install critical dependencies that are commonly missing
-        critical_deps = [
-            # CSS and PostCSS dependencies (most common issues)
-            "@csstools/normalize.css@^12.1.1",
-            "postcss-normalize@^13.0.1",
-            
-            # Core MUI dependencies
-            "@mui/material@^7.3.2",
-            "@mui/icons-material@^7.3.2", 
-            "@emotion/react@^11.14.0",
-            "@emotion/styled@^11.14.1",
-            
-            # Essential utilities
-            "axios@^1.12.2",
-            "react-markdown@^10.1.0",
-            
-            # PDF and canvas utilities
-            "jspdf@^3.0.3",
-            "html2canvas@^1.4.1",
-            
-            # Development utilities
-            "concurrently@^9.2.1"
-        ]
+        # Essential utilities
+        "axios@^1.12.2",
+        "react-markdown@^10.1.0",
         
-        print_colored("Ensuring critical dependencies are installed...", Colors.OKCYAN)
-        for dep in critical_deps:
-            run_npm_command(["install", dep], f"Installing {dep.split('@')[0]}", check=False)
+        # PDF and canvas utilities
+        "jspdf@^3.0.3",
+        "html2canvas@^1.4.1",
         
-        # Try to fix any audit issues without breaking changes
+        # Development utilities
+        "concurrently@^9.2.1"
+    ]
+    
+    # One npm run resolves the tree and writes package-lock.json once for every dependency
+    print_colored("Ensuring critical dependencies are installed...", Colors.OKCYAN)
+    run_npm_command(["install", *quiet, *critical_deps],
+                    "Installing critical dependencies", check=False, cwd=UI_DIR)
+    
+    # `npm audit fix` re-resolves the whole tree, so it only runs on request
+    if audit:
         print_colored("Fixing security vulnerabilities...", Colors.OKCYAN)
-        run_npm_command(["audit", "fix"], "Fixing security issues", check=False)
-        
-        # Verify key packages are installed
-        print_colored("Verifying installation...", Colors.OKCYAN)
-        verification_packages = [
-            "@csstools/normalize.css",
-            "postcss-normalize", 
-            "@mui/material",
-            "react-markdown",
-            "axios"
-        ]
-        
-        for pkg in verification_packages:
-            result = run_npm_command(["list", pkg], f"Checking {pkg}", check=False)
-            if not result:
-                print_colored(f"⚠ {pkg} may need manual installation", Colors.WARNING)
-        
-        return success
-    finally:
-        os.chdir(original_dir)
+        run_npm_command(["audit", "fix"], "Fixing security issues", check=False, cwd=UI_DIR)
+    
+    # Verify key packages are installed
+    print_colored("Verifying installation...", Colors.OKCYAN)
+    verification_packages = [
+        "@csstools/normalize.css",
+        "postcss-normalize", 
+        "@mui/material",
+        "react-markdown",
+        "axios"
+    ]
+    
+    # One `npm list` for all packages; the JSON report covers each of them
+    installed = {}
+    npm_path = find_executable("npm")
+    if npm_path:
+        try:
+            result = subprocess.run([npm_path, "list", *verification_packages, "--depth=0", "--json"],
+                                    cwd=UI_DIR, capture_output=True, text=True, check=False)
+            installed = json.loads(result.stdout or "{}").get("dependencies", {})
+        except (OSError, ValueError):
+            pass
+    for pkg in verification_packages:
+        info = installed.get(pkg)
+        if info and not info.get("missing") and not info.get("invalid"):
+            print_colored(f"✓ {pkg} verified", Colors.OKGREEN)
+        else:
+            print_colored(f"⚠ {pkg} may need manual installation", Colors.WARNING)
+    
+    return success
 
 def create_env_file():
     """Create .env file if it doesn't exist"""
@@ -359,22 +473,21 @@ def create_env_file():
         
         # Check if it has placeholder values
         try:
-            with open(env_file, 'r') as f:
-                content = f.read()
-                if "your_openai_api_key_here" in content:
-                    print_colored("⚠ .env file needs API key configuration", Colors.WARNING)
-                    print("\nPlease edit .env file and add your actual API keys:")
-                    print("1. Get OpenAI API key from: https://platform.openai.com/api-keys")
-                    print("2. Replace 'your_openai_api_key_here' with your actual key")
-                else:
-                    print_colored("✓ .env file appears to be configured", Colors.OKGREEN)
-        except:
-            pass
+            content = env_file.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            content = None
+        if content is not None:
+            if "your_openai_api_key_here" in content:
+                print_colored("⚠ .env file needs API key configuration", Colors.WARNING)
+                print("\nPlease edit .env file and add your actual API keys:")
+                print("1. Get OpenAI API key from: https://platform.openai.com/api-keys")
+                print("2. Replace 'your_openai_api_key_here' with your actual key")
+            else:
+                print_colored("✓ .env file appears to be configured", Colors.OKGREEN)
     else:
         if env_example.exists():
             print_colored("Creating .env file from template...", Colors.OKCYAN)
-            with open(env_example, 'r') as src, open(env_file, 'w') as dst:
-                dst.write(src.read())
+            shutil.copyfile(env_example, env_file)
             print_colored("✓ .env file created", Colors.OKGREEN)
         else:
             # Create basic .env file
@@ -393,56 +506,77 @@ SERPAPI_API_KEY=your_serpapi_key_here_optional
     
     return True
 
+def existing_paths(paths):
+    """Which of `paths` exist, using one directory scan per parent instead of a stat per path"""
+    listings = {}
+    found = set()
+    for path in paths:
+        parent = path.parent
+        if parent not in listings:
+            try:
+                with os.scandir(parent) as entries:
+                    listings[parent] = {entry.name for entry in entries}
+            except OSError:
+                listings[parent] = set()
+        if path.name in listings[parent]:
+            found.add(path)
+    return found
+
+def import_modules(names):
+    """Import each module in-process; returns the first ImportError, or None when all load"""
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            return e
+    return None
+
 def verify_setup():
     """Verify the installation"""
     print_header("VERIFYING SETUP")
     
-    # Test Python imports
-    test_script = """
-try:
-    import fastapi, openai, pandas, numpy
-    print("✓ Core Python packages working")
-except ImportError as e:
-    print(f"✗ Missing package: {e}")
-    exit(1)
-
-try:
-    import sentence_transformers, beautifulsoup4, requests
-    print("✓ Additional Python packages working")
-except ImportError as e:
-    print(f"⚠ Optional package issue: {e}")
-
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-    import os
-    if os.getenv('OPENAI_API_KEY'):
-        if os.getenv('OPENAI_API_KEY') == 'your_openai_api_key_here':
-            print("⚠ .env file needs API key configuration")
-        else:
-            print("✓ Environment configuration loaded")
+    # Test Python imports in this interpreter; it is the same sys.executable pip installed into
+    print_colored("\n[RUNNING] Testing Python setup...", Colors.OKCYAN)
+    importlib.invalidate_caches()
+    core_error = import_modules(["fastapi", "openai", "pandas", "numpy"])
+    if core_error is None:
+        print_colored("✓ Core Python packages working", Colors.OKGREEN)
     else:
-        print("⚠ OPENAI_API_KEY not found in environment")
-except Exception as e:
-    print(f"⚠ Environment loading issue: {e}")
-"""
+        print_colored(f"✗ Missing package: {core_error}", Colors.FAIL)
     
-    run_command(f'{sys.executable} -c "{test_script}"', 
-               "Testing Python setup", check=False)
+    if core_error is None:
+        optional_error = import_modules(["sentence_transformers", "bs4", "requests"])
+        if optional_error is None:
+            print_colored("✓ Additional Python packages working", Colors.OKGREEN)
+        else:
+            print_colored(f"⚠ Optional package issue: {optional_error}", Colors.WARNING)
+        
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+            if os.getenv('OPENAI_API_KEY'):
+                if os.getenv('OPENAI_API_KEY') == 'your_openai_api_key_here':
+                    print_colored("⚠ .env file needs API key configuration", Colors.WARNING)
+                else:
+                    print_colored("✓ Environment configuration loaded", Colors.OKGREEN)
+            else:
+                print_colored("⚠ OPENAI_API_KEY not found in environment", Colors.WARNING)
+        except Exception as e:
+            print_colored(f"⚠ Environment loading issue: {e}", Colors.WARNING)
     
-    # Check Node modules
-    ui_dir = Path("presales-assistant-ui")
-    node_modules = ui_dir / "node_modules"
+    # Check Node modules and project files from one listing per directory
+    node_modules = UI_DIR / "node_modules"
+    required_files = [Path(file) for file in ("ff.py", "Project_Portfolio_Data.xlsx", ".env")]
+    present = existing_paths([node_modules, *required_files])
     
-    if node_modules.exists():
+    if node_modules in present:
         print_colored("✓ Node.js setup verified", Colors.OKGREEN)
     else:
         print_colored("⚠ Node.js setup incomplete", Colors.WARNING)
     
     # Check project files
-    required_files = ["ff.py", "Project_Portfolio_Data.xlsx", ".env"]
     for file in required_files:
-        if Path(file).exists():
+        if file in present:
             print_colored(f"✓ {file} exists", Colors.OKGREEN)
         else:
             print_colored(f"⚠ {file} missing", Colors.WARNING)
@@ -451,6 +585,21 @@ except Exception as e:
 
 def main():
     """Main setup function"""
+    parser = argparse.ArgumentParser(description="AI-Powered Presales Assistant Setup")
+    parser.add_argument("--audit", action="store_true",
+                        help="Also run `npm audit fix` after installing frontend packages")
+    parser.add_argument("--cache-dir", type=Path, default=os.environ.get("PRESALES_SETUP_CACHE"),
+                        help="Keep pip, uv and npm download caches under this directory "
+                             "(e.g. a CI cache mount; default: the tools' own per-user caches)")
+    args = parser.parse_args()
+    
+    # Point both installers at the shared cache; child processes inherit os.environ
+    if args.cache_dir:
+        for tool, variable in (("pip", "PIP_CACHE_DIR"), ("uv", "UV_CACHE_DIR"), ("npm", "npm_config_cache")):
+            tool_cache = Path(args.cache_dir).expanduser() / tool
+            tool_cache.mkdir(parents=True, exist_ok=True)
+            os.environ[variable] = str(tool_cache)
+    
     print_header("AI-POWERED PRESALES ASSISTANT - CROSS-PLATFORM SETUP")
     print_colored("This will set up the complete development environment", Colors.OKCYAN)
     print("Works on Windows, macOS, and Linux")
@@ -460,9 +609,12 @@ def main():
         print_colored("\nSetup cannot continue without prerequisites", Colors.FAIL)
         sys.exit(1)
     
-    # Install dependencies
-    install_python_dependencies()
-    install_node_dependencies()
+    # Install dependencies; pip and npm wait on different registries, so run them side by side
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        installs = [pool.submit(install_python_dependencies),
+                    pool.submit(install_node_dependencies, audit=args.audit)]
+        for future in as_completed(installs):
+            future.result()
     
     # Setup environment
     create_env_file()